@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+import bulk_reader as br
+
+class TestBulkReader(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write("1\n2.5\nABA\n\n4\r\n23,45\n7")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_iter_numbers(self):
+        rejects = br.RejectReport()
+        self.assertEqual(list(br.iter_numbers(self.path, float, rejects)), [1, 2.5, 4, 7])
+        self.assertEqual(rejects.count, 3)
+        self.assertEqual(rejects.samples, ['ABA', '', '23,45'])
+        self.assertIsNone(rejects.lines)
+
+    def test_small_blocks_stay_line_aligned(self):
+        batches = list(br.iter_number_batches(self.path, float, None, block_size=2))
+        self.assertEqual([number for batch in batches for number in batch], [1, 2.5, 4, 7])
+        self.assertGreater(len(batches), 1)
+
+    def test_split_file(self):
+        ranges = br.split_file(self.path, chunk_size=4)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.path))
+        numbers = []
+        for start, end in ranges:
+            numbers.extend(br.iter_numbers(self.path, float, None, start, end))
+        self.assertEqual(numbers, [1, 2.5, 4, 7])
+
+    def test_read_numbers(self):
+        numbers = br.read_numbers(self.path)
+        self.assertEqual(numbers.typecode, 'd')
+        self.assertEqual(list(numbers), [1, 2.5, 4, 7])
+
+    def test_reject_report(self):
+        rejects = br.RejectReport(keep_lines=True, sample_size=1)
+        list(br.iter_numbers(self.path, int, rejects))
+        self.assertEqual(rejects.lines, ['2.5', 'ABA', '', '23,45'])
+        self.assertEqual(rejects.summary('data.txt'),
+                         "Invalid data: 4 line(s) rejected in data.txt ('2.5', ...)")
+
+    def test_empty_file(self):
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+        self.assertEqual(br.split_file(self.path), [])
+        self.assertEqual(list(br.iter_numbers(self.path)), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,6 @@
+import argparse
+import random
+from array import array
 import unittest
 import compute_statistics as cs
 
@@ -27,5 +30,133 @@ class TestComputeStatistics(unittest.TestCase):
         result = cs.compute_variance(self.numbers)
         self.assertAlmostEqual(result, 6.666666666666667, places=7)
 
+    def test_running_statistics(self):
+        accumulator = cs.RunningStatistics().update(self.numbers)
+        self.assertEqual(accumulator.count, 9)
+        self.assertEqual(accumulator.minimum, 1)
+        self.assertEqual(accumulator.maximum, 9)
+        self.assertEqual(accumulator.compute_mean(), 5)
+        self.assertEqual(accumulator.compute_median(), 5)
+        self.assertEqual(accumulator.compute_mode(), 'N/A')
+        self.assertAlmostEqual(accumulator.compute_variance(), 6.666666666666667, places=7)
+
+    def test_running_statistics_even_median_and_mode(self):
+        numbers = [4, 1, 3, 3, 2, 4]
+        accumulator = cs.RunningStatistics().update(numbers)
+        self.assertEqual(accumulator.compute_median(), cs.compute_median(numbers))
+        self.assertEqual(accumulator.compute_mode(), [4, 3])
+
+    def test_running_statistics_batches(self):
+        numbers = [2.5, 7, 1, 2.5, 9, 7, 3, 1e9, -4]
+        whole = cs.RunningStatistics().update(numbers)
+        batched = cs.RunningStatistics().update(numbers[:4]).update(iter(numbers[4:6])).update([])
+        for number in numbers[6:]:
+            batched.add(number)
+        self.assertEqual((batched.count, batched.minimum, batched.maximum), (9, -4, 1e9))
+        self.assertAlmostEqual(batched.compute_variance(), whole.compute_variance(), delta=1e-3)
+        self.assertEqual(batched.results()['Mode'], [2.5, 7])
+        self.assertEqual(batched.results()['Median'], 3)
+
+    def test_merge_running_statistics(self):
+        left = cs.RunningStatistics().update([1, 2, 2, 3])
+        right = cs.RunningStatistics().update([4, 5, 6, 7, 8, 9, 2])
+        merged = left.merge(right)
+        expected = cs.RunningStatistics().update([1, 2, 2, 3, 4, 5, 6, 7, 8, 9, 2])
+        self.assertEqual(merged.count, expected.count)
+        self.assertEqual(merged.compute_median(), expected.compute_median())
+        self.assertEqual(merged.compute_mode(), [2])
+        self.assertAlmostEqual(merged.compute_mean(), expected.compute_mean(), places=7)
+        self.assertAlmostEqual(merged.compute_variance(), expected.compute_variance(), places=7)
+
+    def test_select(self):
+        numbers = [5, 1, 4, 4, 2, 9, 4, 7]
+        for k, expected in enumerate(sorted(numbers)):
+            self.assertEqual(cs.select(numbers, k), expected)
+        self.assertEqual(numbers, [5, 1, 4, 4, 2, 9, 4, 7])
+
+    def test_quantile_sketch_is_deterministic(self):
+        numbers = [(number * 7919) % 10007 for number in range(20000)]
+        first, second = cs.RunningStatistics(0.01), cs.RunningStatistics(0.01)
+        first.update(numbers)
+        second.update(numbers)
+        self.assertEqual(first.sketch.quantiles(cs.QUANTILES), second.sketch.quantiles(cs.QUANTILES))
+
+    def test_quantile_sketch_error(self):
+        for error in (0, -0.1, 1, 2):
+            with self.assertRaises(ValueError):
+                cs.QuantileSketch(error)
+        self.assertEqual(cs.quantile_error_argument('0.05'), 0.05)
+        for text in ('0', '1', 'x'):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                cs.quantile_error_argument(text)
+
+    def test_select_pair(self):
+        generator = random.Random(3)
+        for size in (1, 2, 7, 50, 1000):
+            numbers = [generator.randint(0, size // 3) for _ in range(size)]
+            ordered = sorted(numbers)
+            for k in range(size):
+                expected = (ordered[k], ordered[k + 1] if k + 1 < size else None)
+                self.assertEqual(cs.select_pair(numbers, k), expected)
+            self.assertEqual(cs.compute_median(array('d', numbers)),
+                             (ordered[(size - 1) // 2] + ordered[size // 2]) / 2)
+
+    def test_select_array(self):
+        numbers = array('d', [5, 1, 4, 4, 2, 9, 4, 7])
+        self.assertEqual([cs.select(numbers, k) for k in range(8)], sorted(numbers))
+        self.assertEqual(cs.compute_median(numbers), 4)
+
+    def test_running_statistics_keeps_values_compact(self):
+        accumulator = cs.RunningStatistics().update([0.5, 2.25, 0.5, 7.0, 2.25])
+        self.assertIsInstance(accumulator.values, array)
+        self.assertEqual(accumulator.compute_median(), 2.25)
+        self.assertEqual(accumulator.compute_mode(), [0.5, 2.25])
+
+    def test_quantile_sketch(self):
+        numbers = list(range(100000))
+        left = cs.QuantileSketch(0.01, seed=1)
+        right = cs.QuantileSketch(0.01, seed=2)
+        for number in numbers[:50000]:
+            left.add(number)
+        for number in numbers[50000:]:
+            right.add(number)
+        sketch = left.merge(right)
+        self.assertEqual(sketch.count, 100000)
+        self.assertLess(sketch.size, 1000)
+        for fraction, value in zip(cs.QUANTILES, sketch.quantiles(cs.QUANTILES)):
+            self.assertAlmostEqual(value / 100000, fraction, delta=0.01)
+
+    def test_running_statistics_approximate(self):
+        accumulator = cs.RunningStatistics(quantile_error=0.01).update(self.numbers)
+        results = accumulator.results()
+        self.assertEqual(results['Median'], 5)
+        self.assertEqual(results['P99'], 9)
+        self.assertEqual(len(accumulator.values), 0)
+
+    def test_resolve_backend(self):
+        self.assertEqual(cs.resolve_backend(), 'python')
+        self.assertEqual(cs.resolve_backend('python'), 'python')
+        self.assertEqual(cs.resolve_backend('auto', quantile_error=0.01), 'python')
+        expected = 'python' if cs.np is None else 'numpy'
+        self.assertEqual(cs.resolve_backend('auto'), expected)
+        with self.assertRaises(ValueError):
+            cs.resolve_backend('fortran')
+
+    @unittest.skipIf(cs.np is None, "NumPy is not installed")
+    def test_compute_array_statistics(self):
+        results = cs.compute_array_statistics(cs.np.asarray(self.numbers, dtype=cs.np.float64))
+        self.assertEqual(results['Mean'], 5)
+        self.assertEqual(results['Median'], 5)
+        self.assertEqual(results['Mode'], 'N/A')
+        self.assertAlmostEqual(results['Standard Deviation'], 2.581988897471611, places=7)
+        self.assertAlmostEqual(results['Variance'], 6.666666666666667, places=7)
+
+    @unittest.skipIf(cs.np is None, "NumPy is not installed")
+    def test_compute_array_statistics_mode_order(self):
+        numbers = [4, 1, 3, 3, 2, 4]
+        results = cs.compute_array_statistics(cs.np.asarray(numbers, dtype=cs.np.float64))
+        self.assertEqual(results['Median'], cs.compute_median(numbers))
+        self.assertEqual(results['Mode'], [4, 3])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import argparse
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import convert_numbers as cn
+
+class TestConvertNumbers(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.input_path = os.path.join(self.directory, 'numbers.txt')
+        self.output_path = os.path.join(self.directory, 'ConvertionResults.txt')
+
+    def write_input(self, text):
+        with open(self.input_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    def convert(self, **options):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cn.convert_numbers_in_files([self.input_path], output_path=self.output_path, echo='none',
+                                        **options)
+        return output.getvalue()
+
+    def test_to_base(self):
+        self.assertEqual(cn.to_base(10, 2), '1010')
+        self.assertEqual(cn.to_base(255, 16), 'FF')
+        self.assertEqual(cn.to_base(8, 8), '10')
+        self.assertEqual(cn.to_base(-10, 2), '1010')
+        self.assertEqual(cn.to_base(0, 2), '0')
+        self.assertEqual(cn.to_base(0, 16), '')
+        self.assertEqual(cn.to_base(2 ** 100, 16), '1' + '0' * 25)
+
+    def test_to_base_width(self):
+        self.assertEqual(cn.to_base(-56, 2, 8), '11001000')
+        self.assertEqual(cn.to_base(-1, 16, 8), 'FF')
+        self.assertEqual(cn.to_base(-128, 8, 8), '200')
+        self.assertEqual(cn.to_base(127, 2, 8), '1111111')
+        for n in (128, 200, -129):
+            with self.assertRaises(ValueError):
+                cn.to_base(n, 2, 8)
+        for width in (0, -1):
+            with self.assertRaises(ValueError):
+                cn.to_base(1, 2, width)
+
+    def test_convert_batch(self):
+        numbers = [0, 1, -5, 64, -128, 2 ** 70]
+        for base in (2, 8, 16):
+            self.assertEqual(cn.convert_batch(numbers, base), [cn.to_base(n, base) for n in numbers])
+        self.assertEqual(cn.convert_batch([-1, 5], 2, 4), ['1111', '101'])
+
+    def test_width_argument(self):
+        self.assertEqual(cn.width_argument('16'), 16)
+        for text in ('0', '-8', 'x'):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                cn.width_argument(text)
+
+    def test_convert_with_octal(self):
+        self.write_input("8\n-1\nABC\n")
+        self.convert(octal=True)
+        with open(self.output_path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), f"File: {self.input_path}\nNUMBER|Bin|Hex|Oct\n"
+                                          "8\t1000\t8\t10\t\n-1\t1\t1\t1\t\n")
+
+    def test_convert_out_of_width(self):
+        with open(self.output_path, 'w', encoding='utf-8') as file:
+            file.write("previous results\n")
+        self.write_input("-56\n200\n")
+        self.assertIn("Conversion failed: 200 does not fit in 8 bits.", self.convert(width=8))
+        with open(self.output_path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), "previous results\n")
+        self.assertEqual(sorted(os.listdir(self.directory)), ['ConvertionResults.txt', 'numbers.txt'])
+
+if __name__ == '__main__':
+    unittest.main()
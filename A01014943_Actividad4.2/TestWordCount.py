@@ -0,0 +1,76 @@
+import argparse
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+import word_count as wc
+
+class TestWordCount(unittest.TestCase):
+
+    def setUp(self):
+        generator = random.Random(7)
+        weights = [1 / rank for rank in range(1, 201)]
+        self.words = generator.choices([f"w{rank}" for rank in range(200)], weights, k=20000)
+
+    def assert_bounds(self, summary, exact):
+        self.assertLessEqual(len(summary.counts), summary.capacity)
+        for word, estimate in summary.counts.items():
+            self.assertLessEqual(exact[word], estimate)
+            self.assertLessEqual(estimate, exact[word] + summary.errors[word])
+            self.assertLessEqual(summary.errors[word], summary.total // summary.capacity)
+        for word, count in exact.items():
+            if count > summary.total / summary.capacity:
+                self.assertIn(word, summary.counts)
+
+    def test_eviction(self):
+        summary = wc.SpaceSaving(2)
+        for word in ['a', 'a', 'b', 'c']:
+            summary.add(word)
+        self.assertEqual(summary.counts, {'a': 2, 'c': 2})
+        self.assertEqual(summary.errors, {'a': 0, 'c': 1})
+        self.assertEqual(summary.minimum(), 2)
+        self.assertEqual(summary.total, 4)
+
+    def test_bounds(self):
+        summary = wc.SpaceSaving(20).update(Counter(self.words))
+        self.assertEqual(summary.total, len(self.words))
+        self.assert_bounds(summary, Counter(self.words))
+
+    def test_bounds_after_merge(self):
+        summary = wc.SpaceSaving(20)
+        for start in range(0, len(self.words), 3000):
+            chunk = self.words[start:start + 3000]
+            summary.merge(wc.SpaceSaving(20).update(Counter(chunk)))
+        self.assertEqual(summary.total, len(self.words))
+        self.assert_bounds(summary, Counter(self.words))
+
+    def test_top(self):
+        summary = wc.SpaceSaving(5).update({'a': 5, 'b': 9, 'c': 1, 'd': 7})
+        self.assertEqual(list(summary.top(2).items()), [('b', 9), ('d', 7)])
+        self.assertEqual(len(summary.top()), 4)
+        self.assertEqual(wc.top_words(Counter(a=2, b=3, c=1), 2), {'b': 3, 'a': 2})
+
+    def test_capacity_must_be_positive(self):
+        for capacity in (0, -1):
+            with self.assertRaises(ValueError):
+                wc.SpaceSaving(capacity)
+        self.assertEqual(wc.positive_int('3'), 3)
+        for text in ('0', '-2', 'x'):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                wc.positive_int(text)
+
+    def test_count_words_in_files(self):
+        handle, path = tempfile.mkstemp(suffix='.txt')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            for start in range(0, len(self.words), 10):
+                file.write(' '.join(self.words[start:start + 10]) + '\n')
+        exact = wc.count_words_in_files([path], workers=1, chunk_size=4096)
+        self.assertEqual(exact, Counter(self.words))
+        self.assertEqual(list(exact), list(dict.fromkeys(self.words)))
+        summary = wc.count_words_in_files([path], workers=1, chunk_size=4096, capacity=20)
+        self.assert_bounds(summary, exact)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+""" Module to read large files of numbers or text in memory-mapped, line-aligned blocks."""
+import mmap
+import os
+from array import array
+
+# Size of the blocks converted in one batch.
+BLOCK_SIZE = 4 * 1024 * 1024
+
+# Files larger than this are split into line-aligned byte ranges that can be
+# processed independently.
+CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class RejectReport:
+    """
+    Collects the lines of a file that could not be parsed as numbers.
+
+    Instead of printing every invalid line, the report keeps a count and a few
+    samples for a one-line summary. The full list of rejected lines is only
+    kept when it is going to be written to a side file.
+
+    Attributes:
+        count (int): The number of rejected lines.
+        samples (list): The first rejected lines, for the summary.
+        lines (list): Every rejected line, or None when they are not kept.
+    """
+
+    def __init__(self, keep_lines=False, sample_size=3):
+        self.count = 0
+        self.samples = []
+        self.sample_size = sample_size
+        self.lines = [] if keep_lines else None
+
+    def add(self, line):
+        """Record a rejected line given as bytes."""
+        text = line.decode('utf-8', 'replace').strip()
+        self.count += 1
+        if len(self.samples) < self.sample_size:
+            self.samples.append(text)
+        if self.lines is not None:
+            self.lines.append(text)
+
+    def merge(self, other):
+        """Merge the rejects of another report, keeping the order they were found in."""
+        self.count += other.count
+        self.samples.extend(other.samples[:self.sample_size - len(self.samples)])
+        if self.lines is not None and other.lines is not None:
+            self.lines.extend(other.lines)
+        return self
+
+    def summary(self, file_path):
+        """Return a one-line summary of the rejected lines of a file."""
+        samples = ', '.join(repr(sample) for sample in self.samples)
+        more = ', ...' if self.count > len(self.samples) else ''
+        return f"Invalid data: {self.count} line(s) rejected in {file_path} ({samples}{more})"
+
+    def write(self, file, file_path):
+        """Write the rejected lines of a file to an open side file."""
+        for line in self.lines or []:
+            file.write(f"{file_path}\t{line}\n")
+
+
+def _line_end(mapped, position, end):
+    """Return the offset just past the first newline at or after position - 1."""
+    if position >= end:
+        return end
+    newline = mapped.find(b'\n', position - 1, end)
+    return end if newline == -1 else newline + 1
+
+def split_file(file_path, chunk_size=CHUNK_SIZE):
+    """Split a file into line-aligned (start, end) byte ranges of about chunk_size bytes."""
+    size = os.path.getsize(file_path)
+    ranges = []
+    if not size:
+        return ranges
+    with open(file_path, 'rb') as current_file, \
+            mmap.mmap(current_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = 0
+        while start < size:
+            end = _line_end(mapped, start + chunk_size, size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def iter_blocks(file_path, start=0, end=None, block_size=BLOCK_SIZE):
+    """Yield line-aligned blocks of bytes from a memory-mapped byte range of a file."""
+    size = os.path.getsize(file_path)
+    end = size if end is None else min(end, size)
+    if start >= end:
+        return
+    with open(file_path, 'rb') as current_file, \
+            mmap.mmap(current_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        position = start
+        while position < end:
+            stop = _line_end(mapped, position + block_size, end)
+            yield mapped[position:stop]
+            position = stop
+
+def parse_block(block, convert=float, rejects=None):
+    """
+    Convert the lines of a block of bytes to numbers in one batch.
+
+    The whole block is mapped through convert at once; only a block that
+    contains an invalid line is converted again line by line, recording the
+    invalid lines in rejects.
+    """
+    lines = block.splitlines()
+    try:
+        return list(map(convert, lines))
+    except ValueError:
+        numbers = []
+        for line in lines:
+            try:
+                numbers.append(convert(line))
+            except ValueError:
+                if rejects is not None:
+                    rejects.add(line)
+        return numbers
+
+def iter_number_batches(file_path, convert=float, rejects=None, start=0, end=None,
+                        block_size=BLOCK_SIZE):
+    """Yield the numbers of a byte range of a file, one list per block."""
+    for block in iter_blocks(file_path, start, end, block_size):
+        yield parse_block(block, convert, rejects)
+
+def iter_numbers(file_path, convert=float, rejects=None, start=0, end=None):
+    """Yield the numbers of a byte range of a file one by one."""
+    for batch in iter_number_batches(file_path, convert, rejects, start, end):
+        yield from batch
+
+def read_numbers(file_path, rejects=None, start=0, end=None):
+    """Read the numbers of a byte range of a file into a contiguous float64 array."""
+    numbers = array('d')
+    for batch in iter_number_batches(file_path, float, rejects, start, end):
+        numbers.extend(batch)
+    return numbers
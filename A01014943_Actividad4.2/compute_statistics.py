@@ -1,6 +1,328 @@
 """ Module to compute the mean, median, mode, std deviation and variance of a list of numbers."""
-import sys
+import argparse
+import math
+import os
+import random
 import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice, repeat
+from operator import eq, mul, ne, sub
+from bulk_reader import CHUNK_SIZE, RejectReport, iter_blocks, iter_number_batches, parse_block, split_file
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Quantiles reported next to the median in approximate mode.
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Computation backends. 'python' streams the files in chunks over the worker
+# processes; 'numpy' reads each file into memory in the main process, and
+# 'auto' uses NumPy when it is installed. NumPy is only used on request.
+BACKENDS = ('auto', 'python', 'numpy')
+
+
+def _subset(values, items):
+    """Collect items into a sequence like values, so an array('d') stays a compact array."""
+    return array(values.typecode, items) if isinstance(values, array) else list(items)
+
+def _median_of_three(values):
+    """Return the median of the first, middle and last values as a pivot."""
+    return sorted((values[0], values[len(values) // 2], values[-1]))[1]
+
+def select_pair(numbers, k):
+    """
+    Return the k-th and the (k+1)-th smallest numbers (0-based) in expected linear time.
+
+    Quickselect with a median-of-three pivot and three-way partitioning, so
+    repeated values do not degrade it. Like introselect, it gives up after a
+    logarithmic number of rounds and sorts what is left, which bounds the
+    worst case to O(n log n). The partitions of an array('d') are arrays too.
+
+    The (k+1)-th number comes from the same pass: it is the next value of the
+    last partition, or else the smallest value discarded above it, which is
+    the pivot it was split on. It is None if k is the last rank.
+    """
+    values = numbers
+    following = None
+    depth_limit = 2 * len(values).bit_length()
+    while depth_limit:
+        depth_limit -= 1
+        pivot = _median_of_three(values)
+        lows = _subset(values, (value for value in values if value < pivot))
+        if k < len(lows):
+            values, following = lows, pivot
+            continue
+        k -= len(lows)
+        highs = _subset(values, (value for value in values if value > pivot))
+        equal = len(values) - len(lows) - len(highs)
+        if k < equal:
+            if k + 1 < equal:
+                return pivot, pivot
+            return pivot, min(highs) if highs else following
+        k -= equal
+        values = highs
+    ordered = sorted(values)
+    return ordered[k], ordered[k + 1] if k + 1 < len(ordered) else following
+
+def select(numbers, k):
+    """Return the k-th smallest number (0-based) in expected linear time."""
+    return select_pair(numbers, k)[0]
+
+
+class QuantileSketch:
+    """
+    KLL sketch for approximate quantiles in bounded memory.
+
+    Values go into a hierarchy of compactors. When a level is full it is sorted
+    and every other value is promoted to the level above with twice the weight,
+    so memory stays around O(k log(n / k)) values for a stream of n values.
+    Sketches built on separate chunks can be merged. The coin flips that pick
+    the promoted values come from a fixed seed by default, so the same input
+    always gives the same quantiles.
+
+    Attributes:
+        error (float): The target normalized rank error.
+        k (int): The capacity of the top compactor, derived from the error.
+        count (int): The number of values added to the sketch.
+    """
+
+    def __init__(self, error=0.01, seed=0):
+        if not 0 < error < 1:
+            raise ValueError(f"The quantile error must be between 0 and 1, got {error}")
+        self.error = error
+        self.k = max(8, math.ceil(2 / error))
+        self.count = 0
+        self.size = 0
+        self.max_size = 0
+        self.compactors = []
+        self._random = random.Random(seed)
+        self._grow()
+
+    def _capacity(self, height):
+        """Return the capacity of the compactor at the given height."""
+        depth = len(self.compactors) - height - 1
+        return math.ceil(self.k * (2 / 3) ** depth) + 1
+
+    def _grow(self):
+        """Add a compactor on top of the hierarchy."""
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(height) for height in range(len(self.compactors)))
+
+    def _compress(self):
+        """Compact full levels until the sketch is back under its size limit."""
+        for height, compactor in enumerate(self.compactors):
+            if len(compactor) < self._capacity(height):
+                continue
+            if height + 1 >= len(self.compactors):
+                self._grow()
+            compactor.sort()
+            leftover = len(compactor) % 2
+            self.compactors[height + 1].extend(compactor[leftover + self._random.randrange(2)::2])
+            self.compactors[height] = compactor[:leftover]
+            self.size = sum(len(level) for level in self.compactors)
+            if self.size < self.max_size:
+                return
+
+    def add(self, value):
+        """Add a single value to the sketch."""
+        self.compactors[0].append(value)
+        self.count += 1
+        self.size += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other):
+        """Merge another sketch into this one."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for height, compactor in enumerate(other.compactors):
+            self.compactors[height].extend(compactor)
+        self.count += other.count
+        self.size = sum(len(level) for level in self.compactors)
+        while self.size >= self.max_size:
+            self._compress()
+        return self
+
+    def quantiles(self, fractions):
+        """Return the approximate value at each fraction of the ranked data."""
+        weighted = sorted(
+            (value, 1 << height)
+            for height, compactor in enumerate(self.compactors)
+            for value in compactor
+        )
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for fraction in fractions:
+            target = fraction * total
+            seen = 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    break
+            results.append(value)
+        return results
+
+
+
+class RunningStatistics:
+    """
+    Single-pass accumulator for the descriptive statistics of a stream of numbers.
+
+    Numbers are added a parsed block at a time: the count, mean and M2 of a
+    block are computed with builtins and folded in with the pairwise update of
+    Chan et al., so the file is read once and there is no Python call per
+    value. The reported mean is the running total over the count. The
+    exact median and mode need every value, which are kept in a compact
+    array('d') of 8 bytes per value and sorted once when the results are asked.
+
+    When a quantile error is given, a QuantileSketch replaces the values so
+    memory stays bounded; the median is then approximate, p50/p90/p99 are
+    reported next to it and the mode is not computed.
+
+    Attributes:
+        count (int): The number of values seen.
+        total (float): The running sum of the values.
+        mean (float): The running mean of the values, used for M2.
+        m2 (float): The running sum of squared differences from the mean.
+        minimum (float): The smallest value seen.
+        maximum (float): The largest value seen.
+        values (array): Every value seen, in order, in exact mode.
+        sketch (QuantileSketch): The quantile sketch used in approximate mode.
+    """
+
+    def __init__(self, quantile_error=None):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.values = array('d')
+        self.sketch = None if quantile_error is None else QuantileSketch(quantile_error)
+
+    def _combine(self, count, total, mean, m2, minimum, maximum):
+        """Fold the count, sum, mean, M2, minimum and maximum of other numbers into these."""
+        combined = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / combined
+        self.m2 += m2 + delta * delta * self.count * count / combined
+        self.count = combined
+        self.total += total
+        if self.minimum is None or minimum < self.minimum:
+            self.minimum = minimum
+        if self.maximum is None or maximum > self.maximum:
+            self.maximum = maximum
+
+    def add(self, number):
+        """Add a single number to the accumulator."""
+        return self.update([number])
+
+    def update(self, numbers):
+        """Add a batch of numbers, such as one parsed block, to the accumulator."""
+        if not isinstance(numbers, (list, array)):
+            numbers = list(numbers)
+        if not numbers:
+            return self
+        total = sum(numbers)
+        mean = total / len(numbers)
+        deviations = list(map(sub, numbers, repeat(mean)))
+        self._combine(len(numbers), total, mean, sum(map(mul, deviations, deviations)),
+                      min(numbers), max(numbers))
+        if self.sketch is None:
+            self.values.extend(numbers)
+        else:
+            for number in numbers:
+                self.sketch.add(number)
+        return self
+
+    def merge(self, other):
+        """
+        Merge the statistics of another accumulator into this one.
+
+        Uses the pairwise update of Chan et al. for the mean and M2, so partials
+        computed on separate chunks or files combine to the statistics of their
+        concatenation.
+        """
+        if not other.count:
+            return self
+        self._combine(other.count, other.total, other.mean, other.m2, other.minimum, other.maximum)
+        self.values.extend(other.values)
+        if other.sketch is not None:
+            if self.sketch is None:
+                self.sketch = QuantileSketch(other.sketch.error)
+            self.sketch.merge(other.sketch)
+        return self
+
+    def compute_mean(self):
+        """Compute the mean of the numbers seen so far."""
+        return self.total / self.count
+
+    def compute_variance(self):
+        """Compute the population variance of the numbers seen so far."""
+        return self.m2 / self.count
+
+    def compute_standard_deviation(self):
+        """Compute the population standard deviation of the numbers seen so far."""
+        return self.compute_variance() ** 0.5
+
+    def compute_median(self, ordered=None):
+        """
+        Compute the median, exactly from the sorted values or from the sketch.
+
+        ordered can pass the values already sorted, so they are not sorted again.
+        """
+        if self.sketch is not None:
+            return self.sketch.quantiles([0.5])[0]
+        ordered = sorted(self.values) if ordered is None else ordered
+        middle = len(ordered) // 2
+        if len(ordered) % 2 == 0:
+            return (ordered[middle - 1] + ordered[middle]) / 2
+        return ordered[middle]
+
+    def compute_mode(self, ordered=None):
+        """
+        Compute the mode, keeping the values in order of first appearance.
+
+        The runs of equal values are found in the sorted values with builtins.
+        ordered can pass the values already sorted, so they are not sorted again.
+        """
+        if self.sketch is not None:
+            return 'N/A (approximate)'
+        ordered = sorted(self.values) if ordered is None else ordered
+        starts = [0, *compress(range(1, len(ordered)), map(ne, ordered, islice(ordered, 1, None))),
+                  len(ordered)]
+        lengths = list(map(sub, islice(starts, 1, None), starts))
+        max_count = max(lengths)
+        if max_count == 1:
+            return 'N/A'
+        modes = set(map(ordered.__getitem__, compress(starts, map(eq, lengths, repeat(max_count)))))
+        first_seen = []
+        for value in self.values:
+            if value in modes:
+                first_seen.append(value)
+                modes.discard(value)
+                if not modes:
+                    break
+        return first_seen
+
+    def results(self):
+        """Return the descriptive statistics in the order they are reported."""
+        ordered = sorted(self.values) if self.sketch is None else None
+        results = {
+            'Mean': self.compute_mean(),
+            'Median': self.compute_median(ordered),
+            'Mode': self.compute_mode(ordered),
+            'Standard Deviation': self.compute_standard_deviation(),
+            'Variance': self.compute_variance(),
+        }
+        if self.sketch is not None:
+            for fraction, value in zip(QUANTILES, self.sketch.quantiles(QUANTILES)):
+                results[f'P{round(fraction * 100)}'] = value
+        return results
+
 
 def compute_mean(numbers):
     """Compute the mean of a list of numbers."""
@@ -8,12 +330,11 @@ def compute_mean(numbers):
 
 def compute_median(numbers):
     """Compute the median of a list of numbers."""
-    sorted_numbers = sorted(numbers)
-    n = len(sorted_numbers)
+    n = len(numbers)
     if n % 2 == 0:
-        return (sorted_numbers[n//2 - 1] + sorted_numbers[n//2]) / 2
+        return sum(select_pair(numbers, n//2 - 1)) / 2
     else:
-        return sorted_numbers[n//2]
+        return select(numbers, n//2)
 
 def compute_mode(numbers):
     """Compute the mode of a list of numbers."""
@@ -28,45 +349,210 @@ def compute_mode(numbers):
 
 def compute_standard_deviation(numbers):
     """Compute the standard deviation of a list of numbers."""
-    mean = compute_mean(numbers)
-    squared_diffs = [(num - mean) ** 2 for num in numbers]
-    variance = sum(squared_diffs) / len(numbers)
-    return variance ** 0.5
+    return compute_variance(numbers) ** 0.5
 
 def compute_variance(numbers):
-    """Compute the variance of a list of numbers."""
-    mean = compute_mean(numbers)
-    squared_diffs = [(num - mean) ** 2 for num in numbers]
-    return sum(squared_diffs) / len(numbers)
+    """Compute the variance of a list of numbers in one pass with Welford's algorithm."""
+    count, mean, m2 = 0, 0.0, 0.0
+    for number in numbers:
+        count += 1
+        delta = number - mean
+        mean += delta / count
+        m2 += delta * (number - mean)
+    return m2 / count
+
+def compute_partial_statistics(file_path, start, end, quantile_error=None, keep_rejects=False):
+    """
+    Compute the running statistics of the lines in a byte range of a file.
+
+    A quantile_error switches the partial to the approximate quantile sketch.
+
+    Returns:
+        tuple: The RunningStatistics and the RejectReport of the range.
+    """
+    accumulator = RunningStatistics(quantile_error)
+    rejects = RejectReport(keep_rejects)
+    for batch in iter_number_batches(file_path, float, rejects, start, end):
+        accumulator.update(batch)
+    return accumulator, rejects
+
+def _compute_chunk(task):
+    """Unpack a (file, start, end, quantile_error, keep_rejects) task for the process pool."""
+    return compute_partial_statistics(*task)
+
+def compute_file_statistics(file_paths, workers=None, chunk_size=CHUNK_SIZE, quantile_error=None,
+                            keep_rejects=False):
+    """
+    Compute the merged running statistics of every file, one chunk per task.
+
+    Chunks are summarized in a process pool when there is more than one chunk
+    and more than one worker, and merged back in file order.
+
+    Returns:
+        tuple: The RunningStatistics and the RejectReport of every file, each
+        keyed by file path.
+    """
+    tasks = [
+        (path, start, end, quantile_error, keep_rejects)
+        for path in file_paths
+        for start, end in split_file(path, chunk_size)
+    ]
+    workers = workers or os.cpu_count() or 1
+    partials = {path: RunningStatistics(quantile_error) for path in file_paths}
+    rejects = {path: RejectReport(keep_rejects) for path in file_paths}
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            results = executor.map(_compute_chunk, tasks)
+    else:
+        results = map(_compute_chunk, tasks)
+    for task, (accumulator, chunk_rejects) in zip(tasks, results):
+        partials[task[0]].merge(accumulator)
+        rejects[task[0]].merge(chunk_rejects)
+    return partials, rejects
+
+def read_array(file_path, rejects=None):
+    """
+    Parse a file of numbers into a contiguous float64 NumPy array.
 
-def compute_descriptive_statistics(file_path):
-    """Compute the mean, median, mode, standard deviation, and variance of a list of numbers."""
+    Each memory-mapped block is converted in one vectorized cast; only blocks
+    with invalid lines fall back to the batch parser, which records them in
+    rejects.
+    """
+    parts = []
+    for block in iter_blocks(file_path):
+        try:
+            parts.append(np.array(block.splitlines(), dtype=np.bytes_).astype(np.float64))
+        except ValueError:
+            parts.append(np.array(parse_block(block, float, rejects), dtype=np.float64))
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.float64)
+
+def compute_array_statistics(array):
+    """Compute the descriptive statistics of a NumPy array with vectorized operations."""
+    n = array.size
+    middle = n // 2
+    if n % 2 == 0:
+        partitioned = np.partition(array, [middle - 1, middle])
+        median = float((partitioned[middle - 1] + partitioned[middle]) / 2)
+    else:
+        median = float(np.partition(array, middle)[middle])
+    values, first_index, counts = np.unique(array, return_index=True, return_counts=True)
+    max_count = counts.max()
+    if max_count == 1:
+        mode = 'N/A'
+    else:
+        is_mode = counts == max_count
+        # Report the modes in order of first appearance, like compute_mode().
+        mode = values[is_mode][np.argsort(first_index[is_mode])].tolist()
+    return {
+        'Mean': float(array.mean()),
+        'Median': median,
+        'Mode': mode,
+        'Standard Deviation': float(array.std()),
+        'Variance': float(array.var()),
+    }
+
+def resolve_backend(backend='python', quantile_error=None):
+    """
+    Return the backend to compute with, 'numpy' or 'python'.
+
+    The approximate quantile mode and a missing NumPy install both fall back
+    to the pure-Python streaming path.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == 'python' or quantile_error is not None:
+        return 'python'
+    if np is None:
+        if backend == 'numpy':
+            print("NumPy is not installed, using the Python backend.")
+        return 'python'
+    return 'numpy'
+
+def _compute_numpy_statistics(file_path, keep_rejects=False):
+    """
+    Compute the statistics of every file, and of all files together, with NumPy.
+
+    Returns:
+        tuple: The results and the RejectReport of every file, each keyed by file path.
+    """
+    stats = {}
+    rejects = {}
+    arrays = []
+    for file in file_path:
+        rejects[file] = RejectReport(keep_rejects)
+        values = read_array(file, rejects[file])
+        report_rejects(file, rejects[file])
+        if values.size:
+            stats[file] = compute_array_statistics(values)
+            arrays.append(values)
+            print_results(stats[file])
+        else:
+            print("No valid data found in the file.")
+    if len(stats) > 1:
+        stats['All files'] = compute_array_statistics(np.concatenate(arrays))
+    return stats, rejects
+
+def report_rejects(file_path, rejects):
+    """Print the summary of the invalid lines of a file, if there were any."""
+    if rejects.count:
+        print(rejects.summary(file_path))
+
+def write_rejects_to_file(rejects, rejects_file):
+    """Write every rejected line, prefixed with its file, to a side file."""
+    with open(rejects_file, 'w', encoding='utf-8') as file:
+        for file_path, report in rejects.items():
+            report.write(file, file_path)
+
+def compute_descriptive_statistics(file_path, workers=None, quantile_error=None, backend='python',
+                                   rejects_file=None):
+    """
+    Compute the mean, median, mode, standard deviation, and variance of a list of numbers.
+
+    Invalid lines are summarized once per file; when rejects_file is given,
+    every invalid line is also written to that side file.
+    """
     try:
+        keep_rejects = rejects_file is not None
+        if resolve_backend(backend, quantile_error) == 'numpy':
+            if workers is not None:
+                print("The NumPy backend runs in one process, --workers is ignored.")
+            stats, rejects = _compute_numpy_statistics(file_path, keep_rejects)
+            write_results_to_file(stats)
+            if keep_rejects:
+                write_rejects_to_file(rejects, rejects_file)
+            return
         stats = {}
-        for file in file_path:
-            with open(file, 'r', encoding='utf-8') as current_file:
-                numbers = []
-                results = {}
-                for line in current_file:
-                    try:
-                        number = float(line.strip())
-                        numbers.append(number)
-                    except ValueError:
-                        print(f"Invalid data: {line.strip()}")
-                if numbers:
-                    results['Mean'] = compute_mean(numbers)
-                    results['Median'] = compute_median(numbers)
-                    results['Mode'] = compute_mode(numbers)
-                    results['Standard Deviation'] = compute_standard_deviation(numbers)
-                    results['Variance'] = compute_variance(numbers)
-                    stats[file] = results
-                    print_results(results)
-                else:
-                    print("No valid data found in the file.")
+        overall = RunningStatistics(quantile_error)
+        partials, rejects = compute_file_statistics(
+            file_path, workers, quantile_error=quantile_error, keep_rejects=keep_rejects)
+        for file, accumulator in partials.items():
+            report_rejects(file, rejects[file])
+            if accumulator.count:
+                results = accumulator.results()
+                stats[file] = results
+                overall.merge(accumulator)
+                print_results(results)
+            else:
+                print("No valid data found in the file.")
+        if len(stats) > 1:
+            stats['All files'] = overall.results()
         write_results_to_file(stats)
+        if keep_rejects:
+            write_rejects_to_file(rejects, rejects_file)
     except FileNotFoundError:
         print("File not found.")
 
+def quantile_error_argument(text):
+    """Parse the --error option, which must be between 0 and 1."""
+    try:
+        error = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: '{text}'") from None
+    if not 0 < error < 1:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 1, got {text}")
+    return error
+
+
 def print_results(results):
     """Print the results to the console."""
     for key, value in results.items():
@@ -80,16 +566,29 @@ def write_results_to_file(stats):
         file.write('|'.join(['Statistics'] + list(stats.keys())) + '\n')
 
         # Write the rows
-        for statistic in ['Mean', 'Median', 'Mode', 'Standard Deviation', 'Variance']:
+        statistics = next(iter(stats.values()), {})
+        for statistic in statistics:
             file.write('|'.join([statistic] + [str(stats[file].get(statistic, '')) for file in stats.keys()]) + '\n')
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute descriptive statistics of files of numbers.")
+    parser.add_argument('file_path', nargs='+', help="Files with one number per line.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: one per CPU).")
+    parser.add_argument('--approximate', action='store_true',
+                        help="Estimate the median and p50/p90/p99 with a bounded-memory sketch.")
+    parser.add_argument('--error', type=quantile_error_argument, default=0.01,
+                        help="Target rank error of the approximate quantiles, between 0 and 1 (default: 0.01).")
+    parser.add_argument('--backend', choices=BACKENDS, default='python',
+                        help="Computation backend (default: python). 'numpy' and 'auto' read "
+                             "every file into memory and ignore --workers.")
+    parser.add_argument('--rejects', default=None,
+                        help="Side file to write every invalid line to.")
+    args = parser.parse_args()
     start_time = time.time()
-    if len(sys.argv) < 2:
-        print("Usage: python program.py <file_path>")
-    else:
-        numbers_file_path = sys.argv[1:]
-        compute_descriptive_statistics(numbers_file_path)
+    quantile_error = args.error if args.approximate else None
+    compute_descriptive_statistics(args.file_path, args.workers, quantile_error, args.backend,
+                                   args.rejects)
     end_time = time.time()
     elapsed_time = end_time - start_time
     with open('StatisticsResults.txt', 'a', encoding='utf-8') as f:
@@ -1,82 +1,157 @@
 """ Module to convert a decimal number to binary and hexadecimal."""
+import argparse
+import os
 import sys
 import time
+from bulk_reader import RejectReport, iter_number_batches
+
+# Buffer size of the results file
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Format specifiers of the supported output bases
+BASE_FORMATS = {2: 'b', 8: 'o', 16: 'X'}
+
+# Digits written for zero; hexadecimal has always written zero as an empty string
+ZERO_DIGITS = {2: '0', 8: '0', 16: ''}
+
+def to_base(n, base, width=None):
+    """
+    Convert an integer of any size to binary, octal or hexadecimal digits.
+
+    Negative numbers are written without a sign, unless width is given, in
+    which case every number must fit in a signed integer of that many bits and
+    negative ones are written in two's complement.
+    """
+    if width is not None:
+        if width <= 0:
+            raise ValueError(f"The width must be a positive number of bits, got {width}")
+        if not -(1 << (width - 1)) <= n < 1 << (width - 1):
+            raise ValueError(f"{n} does not fit in {width} bits")
+        if n < 0:
+            n += 1 << width
+    if n == 0:
+        return ZERO_DIGITS[base]
+    return format(abs(n), BASE_FORMATS[base])
+
+def convert_batch(numbers, base, width=None):
+    """Convert a batch of integers to the digits of a base in one call."""
+    if width is None:
+        spec = BASE_FORMATS[base]
+        zero = ZERO_DIGITS[base]
+        return [format(abs(n), spec) if n else zero for n in numbers]
+    return [to_base(n, base, width) for n in numbers]
 
 # Function to convert decimal to binary
-def decimal_to_binary(n):
+def decimal_to_binary(n, width=None):
     """Convert a decimal number to binary."""
-    if n == 0:
-        return '0'
-    binary = ""
-    n = abs(n)
-    while n > 0:
-        binary = str(n % 2) + binary
-        n = n // 2
-    return binary
+    return to_base(n, 2, width)
+
+# Function to convert decimal to octal
+def decimal_to_octal(n, width=None):
+    """Convert a decimal number to octal."""
+    return to_base(n, 8, width)
 
 # Function to convert decimal to hexadecimal
-def decimal_to_hexadecimal(n):
+def decimal_to_hexadecimal(n, width=None):
     """Convert a decimal number to hexadecimal."""
-    hexadecimal = ""
-    hex_map = "0123456789ABCDEF"
-    n = abs(n)
-    while n > 0:
-        hexadecimal = hex_map[n % 16] + hexadecimal
-        n = n // 16
-    return hexadecimal
-
-def convert_numbers_in_files(file_paths):
-    """Convert numbers in files to binary and hexadecimal."""
+    return to_base(n, 16, width)
+
+def convert_rows(path, octal=False, width=None, rejects=None):
+    """
+    Yield the result rows of a file, one list of formatted lines per parsed batch.
+
+    Every row is the original number followed by its binary, hexadecimal and
+    optionally octal digits, each followed by a tab.
+    """
+    for numbers in iter_number_batches(path, int, rejects):
+        if not numbers:
+            continue
+        columns = [map(str, numbers), convert_batch(numbers, 2, width), convert_batch(numbers, 16, width)]
+        if octal:
+            columns.append(convert_batch(numbers, 8, width))
+        yield ['\t'.join(row) + '\t\n' for row in zip(*columns)]
+
+def write_file_results(file, path, octal=False, width=None, echo='summary'):
+    """
+    Stream the converted numbers of one input file into the open results file.
+
+    The header is only written once the file turns out to have valid numbers.
+    With echo 'full' every row is also printed, with 'summary' only the row
+    count, and with 'none' nothing but the invalid data summary.
+
+    Returns:
+        int: The number of numbers converted.
+    """
+    rejects = RejectReport()
+    count = 0
+    for rows in convert_rows(path, octal, width, rejects):
+        if not count:
+            file.write(f"File: {path}\n")
+            file.write('|'.join(['NUMBER', 'Bin', 'Hex'] + (['Oct'] if octal else [])) + '\n')
+        file.writelines(rows)
+        count += len(rows)
+        if echo == 'full':
+            print(''.join(rows), end='')
+    if rejects.count:
+        print(rejects.summary(path))
+    if not count:
+        print("No valid data found in the file.")
+    elif echo == 'summary':
+        print(f"{path}: {count} numbers converted.")
+    return count
+
+def convert_numbers_in_files(file_paths, octal=False, width=None, echo='summary',
+                             output_path='ConvertionResults.txt'):
+    """
+    Convert numbers in files to binary and hexadecimal, and optionally octal.
+
+    Files are converted one at a time and written out batch by batch, so memory
+    does not grow with the size of the inputs. Negative numbers are written in
+    two's complement when width is given. The results go to a temporary file
+    that only replaces output_path once every number was converted, so a number
+    that does not fit in width leaves no half-written results behind.
+    """
+    temporary_path = f"{output_path}.tmp"
     try:
-        converted_numbers = {}
-        for path in file_paths:
-            with open(path, 'r', encoding='utf-8') as current_file:
-                numbers = []
-                results = {}
-                for line in current_file:
-                    try:
-                        number = int(line.strip())
-                        numbers.append(number)
-                    except ValueError:
-                        print(f"Invalid data: {line.strip()}")
-                if numbers:
-                    results['Original'] = numbers
-                    results['Binary'] = [decimal_to_binary(num) for num in numbers]
-                    results['Hexadecimal'] = [decimal_to_hexadecimal(num) for num in numbers]
-                    converted_numbers[path] = results
-                    print_results(results)
-                else:
-                    print("No valid data found in the file.")
-        write_results_to_file(converted_numbers)
+        paths = list(dict.fromkeys(file_paths))
+        for path in paths:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(path)
+        with open(temporary_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as file:
+            for path in paths:
+                write_file_results(file, path, octal, width, echo)
+        os.replace(temporary_path, output_path)
     except FileNotFoundError:
         print("File not found.")
+    except ValueError as error:
+        print(f"Conversion failed: {error}.")
+        os.remove(temporary_path)
 
-def print_results(results):
-    """Print the results to the console."""
-    for key, value in results.items():
-        print(f"{key}: {value}")
-
-# Write the results to a file
-def write_results_to_file(results):
-    """Write the results to a file in a tabular format."""    
-    with open('ConvertionResults.txt', 'w', encoding='utf-8') as file:
-        # Write the headers
-        for key, value in results.items():
-            file.write(f"File: {key}\n")
-            file.write('|'.join(['NUMBER', 'Bin', 'Hex']) + '\n')
-            for index, original in enumerate(value['Original']):
-                file.write(str(original) + '\t')
-                file.write(value['Binary'][index] + '\t')
-                file.write(value['Hexadecimal'][index] + '\t')
-                file.write('\n')
+def width_argument(text):
+    """Parse the --width option, which must be a positive number of bits."""
+    try:
+        width = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'") from None
+    if width <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number of bits, got {text}")
+    return width
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert files of integers to binary and hexadecimal.")
+    parser.add_argument('file_path', nargs='+', help="Files with one integer per line.")
+    parser.add_argument('--octal', action='store_true', help="Add an octal column.")
+    parser.add_argument('--width', type=width_argument, default=None,
+                        help="Write numbers as signed integers of this many bits, negative ones in "
+                             "two's complement.")
+    parser.add_argument('--echo', choices=('summary', 'full', 'none'), default='summary',
+                        help="What to print to the console for each file (default: summary).")
+    args = parser.parse_args()
+    # Allow decimal input and output of integers of any size.
+    if hasattr(sys, 'set_int_max_str_digits'):
+        sys.set_int_max_str_digits(0)
     start_time = time.time()
-    if len(sys.argv) < 2:
-        print("Usage: python program.py <file_path>")
-    else:
-        numbers_file_path = sys.argv[1:]
-        convert_numbers_in_files(numbers_file_path)
+    convert_numbers_in_files(args.file_path, args.octal, args.width, args.echo)
     end_time = time.time()
     elapsed_time = end_time - start_time
     with open('ConvertionResults.txt', 'a', encoding='utf-8') as f:
@@ -1,6 +1,105 @@
 """ Module to count the number of words in a file. """
-import sys
+import argparse
+import heapq
+import os
 import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from bulk_reader import CHUNK_SIZE, iter_blocks, split_file
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the most frequent words in a fixed amount of memory.
+
+    At most capacity words are monitored. When a new word arrives and the
+    summary is full, the word with the lowest count is evicted and the new
+    word inherits that count as its possible overestimate. Every reported
+    count is at most error higher than the true count, and every word that
+    occurs more than total / capacity times is guaranteed to be monitored.
+
+    Attributes:
+        capacity (int): The maximum number of monitored words.
+        counts (dict): The estimated count of every monitored word.
+        errors (dict): The maximum overestimate of every monitored word.
+        total (int): The number of words added to the summary.
+    """
+
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError(f"The capacity must be a positive number of words, got {capacity}")
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # Min-heap of (count, word); counts only grow, so an entry can be stale
+        # but never higher than the current count of its word.
+        self._heap = []
+
+    def _pop_minimum(self):
+        """Remove and return the monitored word with the lowest count."""
+        while True:
+            count, word = heapq.heappop(self._heap)
+            if self.counts[word] == count:
+                return count, word
+            heapq.heappush(self._heap, (self.counts[word], word))
+
+    def add(self, word, count=1):
+        """Add count occurrences of a word to the summary."""
+        self.total += count
+        if word in self.counts:
+            self.counts[word] += count
+            return
+        error = 0
+        if len(self.counts) >= self.capacity:
+            error, evicted = self._pop_minimum()
+            del self.counts[evicted]
+            del self.errors[evicted]
+        self.counts[word] = error + count
+        self.errors[word] = error
+        heapq.heappush(self._heap, (self.counts[word], word))
+
+    def update(self, word_count):
+        """Add the words of a mapping of words to counts to the summary."""
+        for word, count in word_count.items():
+            self.add(word, count)
+        return self
+
+    def minimum(self):
+        """Return the lowest monitored count, or 0 while the summary is not full."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """
+        Merge another summary into this one.
+
+        A word missing from one summary may have occurred up to that summary's
+        minimum count times, so the minimum is added to its count and error.
+        """
+        own_minimum = self.minimum()
+        other_minimum = other.minimum()
+        counts = {}
+        errors = {}
+        for word in list(self.counts) + [word for word in other.counts if word not in self.counts]:
+            counts[word] = self.counts.get(word, own_minimum) + other.counts.get(word, other_minimum)
+            errors[word] = self.errors.get(word, own_minimum) + other.errors.get(word, other_minimum)
+        kept = heapq.nlargest(self.capacity, counts, key=counts.get)
+        kept_set = set(kept)
+        self.counts = {word: counts[word] for word in counts if word in kept_set}
+        self.errors = {word: errors[word] for word in self.counts}
+        self._heap = [(count, word) for word, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+        return self
+
+    def top(self, k=None):
+        """Return the k most frequent monitored words as a dict, in descending order."""
+        k = len(self.counts) if k is None else k
+        return dict(heapq.nlargest(k, self.counts.items(), key=itemgetter(1)))
+
 
 def count_words(file_path):
     """Count the number of words in a file."""
@@ -17,33 +116,130 @@ def count_words(file_path):
 
     return word_count
 
-def print_results(word_count):
+def count_chunk(file_path, start, end, capacity=None):
+    """
+    Count the words in a line-aligned byte range of a file.
+
+    With a capacity, the counts of every block are folded into a SpaceSaving
+    summary, so memory is bounded by one block plus the summary.
+    """
+    word_count = Counter() if capacity is None else SpaceSaving(capacity)
+    for block in iter_blocks(file_path, start, end):
+        words = block.decode('utf-8').split()
+        if capacity is None:
+            word_count.update(words)
+        else:
+            word_count.update(Counter(words))
+    return word_count
+
+def _count_chunk(task):
+    """Unpack a (file, start, end, capacity) task for the process pool."""
+    return count_chunk(*task)
+
+def count_words_in_files(file_paths, workers=None, chunk_size=CHUNK_SIZE, capacity=None):
+    """
+    Count the words of one or many files with a map-reduce over byte chunks.
+
+    Every file is split into line-aligned chunks that are counted in a process
+    pool (map) and merged in file order (reduce), so words keep the order in
+    which they first appear, as with count_words. With a capacity, the result
+    is an approximate SpaceSaving summary instead of an exact Counter.
+    """
+    for file_path in file_paths:
+        if not os.path.isfile(file_path):
+            print(f"Error: File '{file_path}' not found.")
+            return None
+    tasks = [
+        (path, start, end, capacity)
+        for path in file_paths
+        for start, end in split_file(path, chunk_size)
+    ]
+    workers = workers or os.cpu_count() or 1
+    word_count = Counter() if capacity is None else SpaceSaving(capacity)
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            partials = executor.map(_count_chunk, tasks)
+            for partial in partials:
+                _merge(word_count, partial)
+    else:
+        for task in tasks:
+            _merge(word_count, count_chunk(*task))
+    return word_count
+
+def _merge(word_count, partial):
+    """Merge a partial Counter or SpaceSaving summary into the running result."""
+    if isinstance(word_count, SpaceSaving):
+        word_count.merge(partial)
+    else:
+        word_count.update(partial)
+
+def top_words(word_count, k):
+    """Return the k most frequent words of a word count as a dict, in descending order."""
+    if isinstance(word_count, SpaceSaving):
+        return word_count.top(k)
+    return dict(heapq.nlargest(k, word_count.items(), key=itemgetter(1)))
+
+def _format_count(word, count, errors=None):
+    """Format a word count, with its error bound when it is approximate."""
+    if errors is None:
+        return f"{word}: {count}"
+    return f"{word}: {count} (error <= {errors[word]})"
+
+def print_results(word_count, errors=None):
     """Print the results to the console."""
     for word, count in word_count.items():
-        print(f"{word}: {count}")
+        print(_format_count(word, count, errors))
 
-def save_results(word_count, file_path):
-    """Save the results to a file."""
+def save_results(word_count, file_path, total=None, errors=None):
+    """
+    Save the results to a file.
+
+    total is the number of words counted, for when word_count only holds the
+    top words; errors holds the error bound of every approximate count.
+    """
     with open(file_path, 'w', encoding='utf-8') as file:
         total_count = 0
         for word, count in word_count.items():
-            file.write(f"{word}: {count}\n")
+            file.write(_format_count(word, count, errors) + "\n")
             total_count += count
-        file.write(f"Total: {total_count}\n")
+        file.write(f"Total: {total_count if total is None else total}\n")
+
+def positive_int(text):
+    """Parse an option that must be a positive integer."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'") from None
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {text}")
+    return value
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Error: Invalid number of arguments.")
-        print("Usage: python wordCount.py fileWithData.txt")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Count the words in one or many files.")
+    parser.add_argument('file_paths', nargs='+', help="Files with the text to count.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: one per CPU).")
+    parser.add_argument('--top', type=positive_int, default=None, metavar='K',
+                        help="Only report the K most frequent words.")
+    parser.add_argument('--approximate', type=positive_int, default=None, metavar='CAPACITY',
+                        help="Count approximately with a Space-Saving summary of CAPACITY words.")
+    args = parser.parse_args()
 
     start_time = time.time()
-    file_paths = sys.argv[1]
-    word_counts = count_words(file_paths)
+    word_counts = count_words_in_files(args.file_paths, args.workers, capacity=args.approximate)
     end_time = time.time()
 
-    if word_counts:
+    if isinstance(word_counts, SpaceSaving):
+        summary = word_counts
+        word_counts = summary.top(args.top)
+        print_results(word_counts, summary.errors)
+        save_results(word_counts, "WordCountResults.txt", summary.total, summary.errors)
+        print(f"Counts are at most {summary.total // summary.capacity} too high.")
+    elif word_counts:
+        total = sum(word_counts.values())
+        if args.top is not None:
+            word_counts = top_words(word_counts, args.top)
         print_results(word_counts)
-        save_results(word_counts, "WordCountResults.txt")
+        save_results(word_counts, "WordCountResults.txt", total)
 
     print(f"Execution time: {end_time - start_time} seconds")
@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from decimal import Decimal
+from unittest.mock import patch
+import compute_sales as cs
+
+# Test cases shipped next to the module.
+HERE = os.path.dirname(os.path.abspath(__file__))
+TEST_CASES = [os.path.join(HERE, case, f"{case}.Sales.json") for case in ('TC1', 'TC2', 'TC3')]
+
+SALES = ('[{"SALE_ID": 1, "SALE_Date": "01/12/23", "Product": "Rustic breakfast", "Quantity": 12345},'
+         ' {"SALE_ID": 2, "SALE_Date": "01/12/23", "Product": "Sandwich \\"Mixed\\" Salad",'
+         ' "Quantity": 1.25}]')
+
+class TestComputeSales(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.catalogue = os.path.join(self.directory, 'catalogue.json')
+        self.write_catalogue('[{"title": "Rustic breakfast", "price": 21.32},'
+                             ' {"title": "Sandwich", "price": 3},'
+                             ' {"title": "Sandwich", "price": 4.5}]')
+
+    def write_catalogue(self, text, mtime_ns=None):
+        with open(self.catalogue, 'w', encoding='utf-8') as file:
+            file.write(text)
+        if mtime_ns is not None:
+            os.utime(self.catalogue, ns=(mtime_ns, mtime_ns))
+
+    def read_records(self, text, read_size=cs.READ_SIZE):
+        return list(cs.JsonRecordReader(io.StringIO(text), read_size))
+
+    def test_read_array(self):
+        records = self.read_records(SALES)
+        self.assertEqual([record['Quantity'] for record in records], [12345, Decimal('1.25')])
+        self.assertEqual(records[1]['Product'], 'Sandwich "Mixed" Salad')
+
+    def test_read_across_block_boundaries(self):
+        expected = json.loads(SALES, parse_float=Decimal)
+        for read_size in range(1, 12):
+            self.assertEqual(self.read_records(SALES, read_size), expected)
+
+    def test_number_at_end_of_block(self):
+        for read_size in range(1, 8):
+            self.assertEqual(self.read_records('123456\n7.25', read_size), [123456, Decimal('7.25')])
+
+    def test_read_json_lines(self):
+        text = '{"Product": "Sandwich", "Quantity": 2}\n\n{"Product": "Rustic breakfast", "Quantity": 1}\n'
+        for read_size in (3, cs.READ_SIZE):
+            records = self.read_records(text, read_size)
+            self.assertEqual([record['Product'] for record in records], ['Sandwich', 'Rustic breakfast'])
+
+    def test_read_empty(self):
+        self.assertEqual(self.read_records('[]'), [])
+        self.assertEqual(self.read_records('  [\n ]  ', 2), [])
+        self.assertEqual(self.read_records(''), [])
+
+    def test_read_invalid_separator(self):
+        with self.assertRaises(ValueError):
+            self.read_records('[{"Quantity": 1} {"Quantity": 2}]')
+
+    def test_build_price_index_duplicates(self):
+        price_index, duplicates = cs.build_price_index(cs.iter_json_records(self.catalogue))
+        self.assertEqual(price_index, {'Rustic breakfast': Decimal('21.32'), 'Sandwich': 3})
+        self.assertEqual(duplicates, {'Sandwich': [3, Decimal('4.5')]})
+
+    def test_unknown_products(self):
+        price_index = {'Sandwich': 3}
+        sales = [{'Product': 'Sandwich', 'Quantity': 2}, {'Product': 'Soup', 'Quantity': 1},
+                 {'Product': 'Soup', 'Quantity': 4}]
+        aggregate = cs.aggregate_sales(sales, price_index)
+        self.assertEqual(aggregate.total, 6)
+        self.assertEqual(aggregate.unknown_products, {'Soup': 2})
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cs.report_catalogue_issues({'Sandwich': [3, 4]}, aggregate.unknown_products)
+        self.assertEqual(output.getvalue(),
+                         "Duplicate product in catalogue: Sandwich (prices [3, 4], using 3)\n"
+                         "Unknown product: Soup (2 sale line(s) not counted)\n")
+
+    def test_sale_without_group_fields(self):
+        aggregate = cs.aggregate_sales([{'Product': 'Sandwich', 'Quantity': 2}], {'Sandwich': 3})
+        self.assertEqual(aggregate.total, 6)
+        self.assertEqual(aggregate.groups['SALE_ID'], {})
+        self.assertEqual(aggregate.groups['Product'], {'Sandwich': {'Quantity': 2, 'Total': 6}})
+
+    def test_write_sales_report(self):
+        sales = [{'SALE_ID': 1, 'SALE_Date': '01/12/23', 'Product': 'Sandwich', 'Quantity': 2},
+                 {'SALE_ID': 1, 'SALE_Date': '01/12/23', 'Product': 'Soup', 'Quantity': Decimal('1.5')},
+                 {'SALE_ID': 2, 'SALE_Date': '02/12/23', 'Product': 'Sandwich', 'Quantity': 1}]
+        aggregate = cs.aggregate_sales(sales, {'Sandwich': Decimal('3.10'), 'Soup': 4})
+        self.assertEqual(aggregate.groups['SALE_ID'], {1: {'Quantity': Decimal('3.5'), 'Total': Decimal('12.20')},
+                                                       2: {'Quantity': 1, 'Total': Decimal('3.10')}})
+        report_path = os.path.join(self.directory, 'SalesReport')
+        cs.write_sales_report(aggregate, report_path)
+        with open(f"{report_path}.txt", encoding='utf-8') as file:
+            text = file.read()
+        self.assertIn("Totals by SALE_ID\nSALE_ID|Quantity|Total\n1|3.5|12.20\n2|1|3.10\n\n", text)
+        self.assertIn("Totals by Product\nProduct|Quantity|Total\nSandwich|3|9.30\nSoup|1.5|6.00\n\n", text)
+        self.assertTrue(text.endswith("Total cost of all sales: $15.30\n"))
+        with open(f"{report_path}.csv", encoding='utf-8', newline='') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ['Group', 'Key', 'Quantity', 'Total'])
+        self.assertEqual(rows[1:], [['SALE_ID', '1', '3.5', '12.20'], ['SALE_ID', '2', '1', '3.10'],
+                                    ['SALE_Date', '01/12/23', '3.5', '12.20'],
+                                    ['SALE_Date', '02/12/23', '1', '3.10'],
+                                    ['Product', 'Sandwich', '3', '9.30'], ['Product', 'Soup', '1.5', '6.00']])
+
+    def test_report_fractional_quantity(self):
+        aggregate = cs.aggregate_sales([{'SALE_ID': 1, 'Product': 'Sandwich', 'Quantity': Decimal('1.5')}],
+                                       {'Sandwich': Decimal('2.5')})
+        report_path = os.path.join(self.directory, 'SalesReport')
+        cs.write_sales_report(aggregate, report_path)
+        with open(f"{report_path}.json", encoding='utf-8') as file:
+            report = json.load(file)
+        self.assertEqual(report['groups']['SALE_ID'], [{'SALE_ID': 1, 'Quantity': 1.5, 'Total': 3.75}])
+
+    def write_sales(self, name, text=SALES):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def test_resolve_sales_files(self):
+        sales_dir = os.path.join(self.directory, 'sales')
+        os.mkdir(sales_dir)
+        first = self.write_sales(os.path.join('sales', 'b.json'))
+        second = self.write_sales(os.path.join('sales', 'a.jsonl'))
+        self.write_sales(os.path.join('sales', 'notes.txt'))
+        self.assertEqual(cs.resolve_sales_files(sales_dir), [second, first])
+        self.assertEqual(cs.resolve_sales_files([os.path.join(sales_dir, '*.json'), self.catalogue]),
+                         [first, self.catalogue])
+
+    def test_resolve_no_sales_files(self):
+        empty_dir = os.path.join(self.directory, 'empty')
+        os.mkdir(empty_dir)
+        for sales_record in (empty_dir, os.path.join(self.directory, '*.jsonl')):
+            with self.assertRaises(FileNotFoundError):
+                cs.resolve_sales_files([self.catalogue, sales_record])
+
+    def test_parallel_matches_serial(self):
+        price_index, _ = cs.load_price_index(os.path.join(HERE, 'TC1', 'TC1.ProductList.json'), None)
+        serial = cs.aggregate_sales_files(TEST_CASES, price_index, workers=1)
+        parallel = cs.aggregate_sales_files(TEST_CASES, price_index, workers=2)
+        self.assertGreater(serial.total, 0)
+        self.assertEqual(parallel.total, serial.total)
+        self.assertEqual(parallel.groups, serial.groups)
+        self.assertEqual(parallel.unknown_products, serial.unknown_products)
+        single = [cs.aggregate_sales_files([path], price_index, workers=1).total for path in TEST_CASES]
+        self.assertEqual(parallel.total, sum(single))
+
+    def test_cache_hit(self):
+        cache_dir = os.path.join(self.directory, 'cache')
+        expected = cs.load_price_index(self.catalogue, cache_dir)
+        with patch('compute_sales.build_price_index') as build:
+            price_index, duplicates = cs.load_price_index(self.catalogue, cache_dir)
+            build.assert_not_called()
+        self.assertEqual((price_index, duplicates), expected)
+        self.assertEqual([type(price) for price in price_index.values()], [Decimal, int])
+        self.assertEqual([type(price) for price in duplicates['Sandwich']], [int, Decimal])
+        self.assertEqual(os.stat(cache_dir).st_mode & 0o777, 0o700)
+
+    def test_cache_miss_after_change(self):
+        cache_dir = os.path.join(self.directory, 'cache')
+        mtime_ns = os.stat(self.catalogue).st_mtime_ns
+        cs.load_price_index(self.catalogue, cache_dir)
+        # Same size, only the modification time tells the catalogues apart.
+        self.write_catalogue('[{"title": "Rustic breakfast", "price": 99.99},'
+                             ' {"title": "Sandwich", "price": 3},'
+                             ' {"title": "Sandwich", "price": 4.5}]', mtime_ns + 10**9)
+        price_index, _ = cs.load_price_index(self.catalogue, cache_dir)
+        self.assertEqual(price_index['Rustic breakfast'], Decimal('99.99'))
+
+    def test_corrupt_cache_is_a_miss(self):
+        cache_dir = os.path.join(self.directory, 'cache')
+        expected = cs.load_price_index(self.catalogue, cache_dir)
+        for text in ('not json', '[]', '{"key": null}'):
+            with open(cs._cache_path(self.catalogue, cache_dir), 'w', encoding='utf-8') as file:
+                file.write(text)
+            self.assertEqual(cs.load_price_index(self.catalogue, cache_dir), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,26 +1,401 @@
 """ Module to compute the total cost of all sales given a price catalogue and a sales record. """
+import argparse
+import csv
+import glob
+import hashlib
 import json
-import sys
+import os
+import re
 import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
 
-def compute_sales(price_catalogue_file, sales_record_file):
-    """ Compute the total cost of all sales given a price catalogue and a sales record. """
-    # Load the price catalogue
-    with open(price_catalogue_file, encoding='utf-8') as f:
-        price_catalogue_json = json.load(f)
+# Number of characters read from a JSON file at a time.
+READ_SIZE = 1024 * 1024
 
-    # Load the sales record
-    with open(sales_record_file, encoding='utf-8') as f:
-        sales_record_json = json.load(f)
+WHITESPACE = re.compile(r'\s*')
 
-    # Compute the total cost for all sales
-    total_cost = 0
-    for sale in sales_record_json:
+# Characters that can follow the part of a number read so far, up to the end of the text.
+NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*\Z')
+
+# Sale fields the sales are grouped by in the report.
+GROUP_FIELDS = ('SALE_ID', 'SALE_Date', 'Product')
+
+# Extensions of the sales files picked up from a directory.
+SALES_EXTENSIONS = ('.json', '.jsonl')
+
+# Directory of the compiled price catalogue caches, private to the user.
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                         'compute_sales')
+
+# Format version of the catalogue cache files.
+CACHE_VERSION = 2
+
+# Price index shared with the worker processes by _init_worker.
+_PRICE_INDEX = None
+
+
+class JsonRecordReader:
+    """
+    Incrementally reads the records of a top-level JSON array or a JSON Lines file.
+
+    Text is read in blocks and every record is decoded as soon as it is
+    complete, so memory depends on the size of one record and one block, not on
+    the size of the file. Numbers with a fraction are decoded as Decimal, so
+    prices and totals are exact.
+    """
+
+    def __init__(self, file, read_size=READ_SIZE):
+        self.file = file
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder(parse_float=Decimal)
+        self.buffer = ''
+        self.position = 0
+
+    def _fill(self):
+        """Read the next block, dropping the consumed text; return False at end of file."""
+        block = self.file.read(self.read_size)
+        if not block:
+            return False
+        self.buffer = self.buffer[self.position:] + block
+        self.position = 0
+        return True
+
+    def _peek(self):
+        """Skip whitespace and return the next character, or '' at end of file."""
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ''
+
+    def _decode(self):
+        """Decode the next value, reading more text as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number followed only by number characters up to the end of the
+            # buffer may have been cut in half, for example "7." of "7.25".
+            if (isinstance(value, (int, float, Decimal)) and NUMBER_TAIL.match(self.buffer, end)
+                    and self._fill()):
+                continue
+            self.position = end
+            return value
+
+    def __iter__(self):
+        if self._peek() != '[':
+            while self._peek():
+                yield self._decode()
+            return
+        self.position += 1
+        if self._peek() == ']':
+            return
+        while True:
+            yield self._decode()
+            separator = self._peek()
+            self.position += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+
+def iter_json_records(file_path):
+    """Yield the records of a JSON array or JSON Lines file one at a time."""
+    with open(file_path, encoding='utf-8') as f:
+        yield from JsonRecordReader(f)
+
+def build_price_index(price_catalogue):
+    """
+    Compile the price catalogue into a title -> price index.
+
+    When a title appears more than once, the first price is kept.
+
+    Returns:
+        tuple: The price index and a dict of every duplicated title to all its prices.
+    """
+    price_index = {}
+    duplicates = {}
+    for item in price_catalogue:
+        title = item['title']
+        if title in price_index:
+            duplicates.setdefault(title, [price_index[title]]).append(item['price'])
+        else:
+            price_index[title] = item['price']
+    return price_index, duplicates
+
+def _cache_key(price_catalogue_file):
+    """Return the path, size and modification time that identify a catalogue version."""
+    stat = os.stat(price_catalogue_file)
+    return {
+        'version': CACHE_VERSION,
+        'path': os.path.abspath(price_catalogue_file),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+def _cache_path(price_catalogue_file, cache_dir):
+    """Return the cache file of a catalogue, named after a hash of its absolute path."""
+    digest = hashlib.sha1(os.path.abspath(price_catalogue_file).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json")
+
+def _parse_price(text):
+    """Return a price saved in the cache as text, as an int or a Decimal like the catalogue."""
+    if text.lstrip('-').isdigit():
+        return int(text)
+    return Decimal(text)
+
+def _read_cache(cache_path, key):
+    """Return the cached index of a catalogue, or None if the cache is missing, stale or invalid."""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache['key'] != key:
+            return None
+        price_index = {title: _parse_price(price) for title, price in cache['prices'].items()}
+        duplicates = {title: [_parse_price(price) for price in prices]
+                      for title, prices in cache['duplicates'].items()}
+    except Exception:  # pylint: disable=broad-except
+        # A cache that cannot be read for any reason is rebuilt.
+        return None
+    return price_index, duplicates
+
+def _write_cache(cache_path, key, price_index, duplicates):
+    """Save the index of a catalogue as plain JSON text; a cache that cannot be written is skipped."""
+    cache = {
+        'key': key,
+        'prices': {title: str(price) for title, price in price_index.items()},
+        'duplicates': {title: [str(price) for price in prices] for title, prices in duplicates.items()},
+    }
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        pass
+
+def load_price_index(price_catalogue_file, cache_dir=CACHE_DIR):
+    """
+    Load the title -> price index of a catalogue, compiling it only when it changed.
+
+    The compiled index is saved to cache_dir as a flat JSON object of every
+    title to its price as text, behind the catalogue's path, size and
+    modification time, so reading the cache can never run code. When these
+    still match, the index is loaded without parsing the catalogue;
+    otherwise, or if the cache cannot be read, the catalogue is compiled and
+    the cache rewritten. A cache_dir of None disables the cache.
+
+    Returns:
+        tuple: The price index and a dict of every duplicated title to all its prices.
+    """
+    if cache_dir is None:
+        return build_price_index(iter_json_records(price_catalogue_file))
+    key = _cache_key(price_catalogue_file)
+    cache_path = _cache_path(price_catalogue_file, cache_dir)
+    cached = _read_cache(cache_path, key)
+    if cached is not None:
+        return cached
+    price_index, duplicates = build_price_index(iter_json_records(price_catalogue_file))
+    _write_cache(cache_path, key, price_index, duplicates)
+    return price_index, duplicates
+
+class SalesAggregate:
+    """
+    Totals of a sales record, overall and grouped by sale, date and product.
+
+    Every sale line updates the grand total and one hash table entry per
+    group field, so all the views are computed in a single pass. Only
+    Product and Quantity are required; a sale line without one of the other
+    group fields is left out of that grouping only.
+
+    Attributes:
+        total (Decimal): The total cost of all sales.
+        groups (dict): For every field of GROUP_FIELDS, a dict of every value
+            of that field to its quantity and total.
+        unknown_products (dict): Every product missing from the catalogue to
+            its number of sale lines.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.groups = {field: {} for field in GROUP_FIELDS}
+        self.unknown_products = {}
+
+    def add(self, sale, price_index):
+        """Add a sale line, priced with the catalogue index."""
         product_id = sale['Product']
+        price = price_index.get(product_id)
+        if price is None:
+            self.unknown_products[product_id] = self.unknown_products.get(product_id, 0) + 1
+            return
         quantity = sale['Quantity']
-        for item in price_catalogue_json:
-            if product_id == item['title']:
-                total_cost += item['price'] * quantity
+        cost = price * quantity
+        self.total += cost
+        for field, group in self.groups.items():
+            key = sale.get(field)
+            if key is None:
+                continue
+            totals = group.get(key)
+            if totals is None:
+                group[key] = {'Quantity': quantity, 'Total': cost}
+            else:
+                totals['Quantity'] += quantity
+                totals['Total'] += cost
+
+    def merge(self, other):
+        """
+        Merge the totals of another aggregate into this one.
+
+        Amounts are Decimal, so the merged totals do not depend on how the
+        sales were split; keys keep the order in which they were first seen.
+        """
+        self.total += other.total
+        for field, group in other.groups.items():
+            own_group = self.groups[field]
+            for key, totals in group.items():
+                own_totals = own_group.get(key)
+                if own_totals is None:
+                    own_group[key] = dict(totals)
+                else:
+                    own_totals['Quantity'] += totals['Quantity']
+                    own_totals['Total'] += totals['Total']
+        for product_id, count in other.unknown_products.items():
+            self.unknown_products[product_id] = self.unknown_products.get(product_id, 0) + count
+        return self
+
+def aggregate_sales(sales_record, price_index):
+    """Compute the totals of the sales with one index lookup per sale."""
+    aggregate = SalesAggregate()
+    for sale in sales_record:
+        aggregate.add(sale, price_index)
+    return aggregate
+
+def _init_worker(price_index):
+    """Share the price index with a worker process once, when it starts."""
+    global _PRICE_INDEX  # pylint: disable=global-statement
+    _PRICE_INDEX = price_index
+
+def _aggregate_file(sales_record_file):
+    """Total one sales file with the price index of the worker process."""
+    return aggregate_sales(iter_json_records(sales_record_file), _PRICE_INDEX)
+
+def resolve_sales_files(sales_records):
+    """
+    Expand sales record arguments into a sorted list of files.
+
+    Every argument can be a file, a directory, whose .json and .jsonl files
+    are used, or a glob pattern.
+
+    Raises:
+        FileNotFoundError: If a directory or a glob pattern matches no file.
+    """
+    if isinstance(sales_records, str):
+        sales_records = [sales_records]
+    files = []
+    for sales_record in sales_records:
+        if os.path.isdir(sales_record):
+            matches = sorted(
+                os.path.join(sales_record, name)
+                for name in os.listdir(sales_record)
+                if name.endswith(SALES_EXTENSIONS)
+            )
+        elif glob.has_magic(sales_record):
+            matches = sorted(glob.glob(sales_record))
+        else:
+            matches = [sales_record]
+        if not matches:
+            raise FileNotFoundError(f"No sales record files found in {sales_record}")
+        files.extend(matches)
+    return files
+
+def aggregate_sales_files(sales_record_files, price_index, workers=None):
+    """
+    Total many sales files, one file per shard, and merge them in file order.
+
+    With more than one file and worker, the shards are totalled in a process
+    pool; the price index is sent to every worker once, when it starts.
+    """
+    workers = workers or os.cpu_count() or 1
+    aggregate = SalesAggregate()
+    if workers > 1 and len(sales_record_files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sales_record_files)),
+                                 initializer=_init_worker, initargs=(price_index,)) as executor:
+            for partial in executor.map(_aggregate_file, sales_record_files):
+                aggregate.merge(partial)
+    else:
+        for sales_record_file in sales_record_files:
+            aggregate.merge(aggregate_sales(iter_json_records(sales_record_file), price_index))
+    return aggregate
+
+def _json_number(value):
+    """Return a number that json can write: a Decimal as a float, anything else as is."""
+    return float(value) if isinstance(value, Decimal) else value
+
+def write_sales_report(aggregate, report_path='SalesReport'):
+    """
+    Write the grouped totals as a text table, a CSV file and a JSON file.
+
+    The files are named after report_path with the .txt, .csv and .json extensions.
+    """
+    with open(f"{report_path}.txt", "w", encoding='utf-8') as f:
+        for field, group in aggregate.groups.items():
+            f.write(f"Totals by {field}\n")
+            f.write('|'.join([field, 'Quantity', 'Total']) + '\n')
+            for key, totals in group.items():
+                f.write('|'.join([str(key), str(totals['Quantity']), f"{totals['Total']:.2f}"]) + '\n')
+            f.write('\n')
+        f.write(f"Total cost of all sales: ${aggregate.total:.2f}\n")
+
+    with open(f"{report_path}.csv", "w", encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Group', 'Key', 'Quantity', 'Total'])
+        for field, group in aggregate.groups.items():
+            for key, totals in group.items():
+                writer.writerow([field, key, totals['Quantity'], f"{totals['Total']:.2f}"])
+
+    report = {
+        'total': float(aggregate.total),
+        'groups': {
+            field: [
+                {field: key, 'Quantity': _json_number(totals['Quantity']),
+                 'Total': float(totals['Total'])}
+                for key, totals in group.items()
+            ]
+            for field, group in aggregate.groups.items()
+        },
+        'unknown_products': aggregate.unknown_products,
+    }
+    with open(f"{report_path}.json", "w", encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+def report_catalogue_issues(duplicates, unknown_products):
+    """Print the duplicated titles of the catalogue and the products missing from it."""
+    for title, prices in duplicates.items():
+        print(f"Duplicate product in catalogue: {title} (prices {prices}, using {prices[0]})")
+    for product_id, count in unknown_products.items():
+        print(f"Unknown product: {product_id} ({count} sale line(s) not counted)")
+
+def compute_sales(price_catalogue_file, sales_record_file, workers=None, cache_dir=CACHE_DIR):
+    """
+    Compute the total cost of all sales given a price catalogue and a sales record.
+
+    sales_record_file can also be a directory, a glob pattern or a list of them.
+    """
+    # Index the price catalogue, or load the index compiled by a previous run
+    price_index, duplicates = load_price_index(price_catalogue_file, cache_dir)
+
+    # Compute the total cost for all sales, streaming the sales records
+    sales_record_files = resolve_sales_files(sales_record_file)
+    aggregate = aggregate_sales_files(sales_record_files, price_index, workers)
+    report_catalogue_issues(duplicates, aggregate.unknown_products)
+    total_cost = aggregate.total
 
     # Print the total cost
     print(f"Total cost of all sales: ${total_cost}")
@@ -29,17 +404,30 @@ def compute_sales(price_catalogue_file, sales_record_file):
     with open("SalesResults.txt", "w", encoding='utf-8') as f:
         f.write(f"Total cost of all sales: ${total_cost}")
 
+    # Write the totals by sale, date and product next to it
+    write_sales_report(aggregate)
+
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python computeSales.py priceCatalogue.json salesRecord.json")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Compute the total cost of all sales given a price catalogue and sales records.")
+    parser.add_argument('price_catalogue', help="JSON price catalogue.")
+    parser.add_argument('sales_records', nargs='+',
+                        help="Sales record files, directories of them or glob patterns.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: one per CPU).")
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f"Directory of the compiled catalogue cache (default: {CACHE_DIR}).")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always parse the catalogue instead of using the cache.")
+    args = parser.parse_args()
 
     start_time = time.time()
 
-    price_catalogue = sys.argv[1]
-    sales_record = sys.argv[2]
-
-    compute_sales(price_catalogue, sales_record)
+    try:
+        compute_sales(args.price_catalogue, args.sales_records, args.workers,
+                      None if args.no_cache else args.cache_dir)
+    except FileNotFoundError as error:
+        parser.error(str(error))
 
     end_time = time.time()
     elapsed_time = end_time - start_time
@@ -0,0 +1,222 @@
+""" Module to index the reserved date ranges of the rooms of a hotel. """
+from bisect import bisect_left, bisect_right
+from datetime import date
+from reservation import Reservation, to_ordinal
+
+
+def span(reservation):
+    """
+    Returns the start and end date ordinals of a Reservation or a reservation dictionary.
+    """
+    if isinstance(reservation, Reservation):
+        return reservation.start, reservation.end
+    return to_ordinal(reservation['start_date']), to_ordinal(reservation['end_date'])
+
+
+class RoomSchedule:
+    """
+    Represents the reservations of a single room, sorted by start date.
+
+    Dates are date ordinals, so every comparison is an integer comparison.
+
+    Attributes:
+        starts (list): The start dates of the reservations, in ascending order.
+        ends (list): The end date of the reservation at the same position.
+        ids (list): The ID of the reservation at the same position.
+        max_ends (list): The latest end date among the reservations up to the same position.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        self.max_ends = []
+
+    def _refresh_max_ends(self, position):
+        """Recomputes the running latest end date from the given position on."""
+        del self.max_ends[position:]
+        latest = self.max_ends[-1] if self.max_ends else None
+        for end in self.ends[position:]:
+            latest = end if latest is None or end > latest else latest
+            self.max_ends.append(latest)
+
+    def add(self, reservation_id, start_date, end_date):
+        """
+        Adds a reservation to the schedule.
+
+        Args:
+            reservation_id (int): The ID of the reservation.
+            start_date (int): The start date of the reservation.
+            end_date (int): The end date of the reservation.
+        """
+        position = bisect_right(self.starts, start_date)
+        self.starts.insert(position, start_date)
+        self.ends.insert(position, end_date)
+        self.ids.insert(position, reservation_id)
+        self._refresh_max_ends(position)
+
+    def extend(self, entries):
+        """
+        Adds many reservations at once, sorting the schedule a single time.
+
+        Args:
+            entries (list): (start_date, end_date, reservation_id) tuples.
+        """
+        entries = sorted(list(zip(self.starts, self.ends, self.ids)) + entries, key=lambda entry: entry[0])
+        self.starts = [entry[0] for entry in entries]
+        self.ends = [entry[1] for entry in entries]
+        self.ids = [entry[2] for entry in entries]
+        self.max_ends = []
+        self._refresh_max_ends(0)
+
+    def remove(self, reservation_id, start_date):
+        """
+        Removes a reservation from the schedule.
+
+        Args:
+            reservation_id (int): The ID of the reservation.
+            start_date (int): The start date of the reservation.
+
+        Returns:
+            bool: True if the reservation was found and removed, False otherwise.
+        """
+        position = bisect_left(self.starts, start_date)
+        while position < len(self.starts) and self.starts[position] == start_date:
+            if self.ids[position] == reservation_id:
+                del self.starts[position]
+                del self.ends[position]
+                del self.ids[position]
+                self._refresh_max_ends(position)
+                return True
+            position += 1
+        return False
+
+    def is_free(self, start_date, end_date):
+        """
+        Checks that no reservation overlaps a date range.
+
+        Only reservations starting before end_date can overlap the range, and
+        they all do unless the latest of their end dates is not after start_date.
+
+        Args:
+            start_date (int): The start date of the date range.
+            end_date (int): The end date of the date range.
+
+        Returns:
+            bool: True if the room is free for the whole range, False otherwise.
+        """
+        position = bisect_left(self.starts, end_date)
+        return position == 0 or self.max_ends[position - 1] <= start_date
+
+
+class AvailabilityIndex:
+    """
+    Represents an in-memory index of the reservations of a hotel, per room.
+
+    Availability checks are a binary search in the schedule of the room and
+    never read the hotel data file. The number of rooms reserved on every
+    night is kept as well, for occupancy reports.
+
+    Attributes:
+        rooms (dict): The RoomSchedule of every room with reservations.
+        occupied (dict): The number of reserved rooms of every night, by date ordinal.
+    """
+
+    def __init__(self, reservations=()):
+        """
+        Initializes the index with the given reservations.
+
+        Args:
+            reservations (iterable): Reservations, or dictionaries as produced by Reservation.to_dict.
+        """
+        self.rooms = {}
+        self.occupied = {}
+        entries = {}
+        for reservation in reservations:
+            start, end = span(reservation)
+            entries.setdefault(reservation['room_number'], []).append((start, end, reservation['id']))
+            self._occupy(start, end, 1)
+        for room_number, room_entries in entries.items():
+            self.rooms[room_number] = RoomSchedule()
+            self.rooms[room_number].extend(room_entries)
+
+    def _occupy(self, start, end, change):
+        """
+        Adds change to the number of reserved rooms of every night from start up to end.
+        """
+        for night in range(start, end):
+            count = self.occupied.get(night, 0) + change
+            if count:
+                self.occupied[night] = count
+            else:
+                del self.occupied[night]
+
+    def add(self, reservation):
+        """
+        Adds a reservation, or a reservation dictionary, to the index.
+        """
+        start, end = span(reservation)
+        schedule = self.rooms.get(reservation['room_number'])
+        if schedule is None:
+            schedule = self.rooms[reservation['room_number']] = RoomSchedule()
+        schedule.add(reservation['id'], start, end)
+        self._occupy(start, end, 1)
+
+    def remove(self, reservation):
+        """
+        Removes a reservation, or a reservation dictionary, from the index.
+
+        Returns:
+            bool: True if the reservation was found and removed, False otherwise.
+        """
+        start, end = span(reservation)
+        schedule = self.rooms.get(reservation['room_number'])
+        if schedule is None or not schedule.remove(reservation['id'], start):
+            return False
+        self._occupy(start, end, -1)
+        return True
+
+    def is_available(self, room_number, start_date, end_date):
+        """
+        Checks the availability of a room within a specified date range.
+
+        Args:
+            room_number (int): The number of the room to check availability for.
+            start_date (str or date): The start date of the date range to check.
+            end_date (str or date): The end date of the date range to check.
+
+        Returns:
+            bool: True if the room is available, False otherwise.
+        """
+        schedule = self.rooms.get(room_number)
+        return schedule is None or schedule.is_free(to_ordinal(start_date), to_ordinal(end_date))
+
+    def free_rooms(self, room_numbers, start_date, end_date):
+        """
+        Returns the rooms that are free for a whole date range.
+
+        Args:
+            room_numbers (iterable): The rooms to check.
+            start_date (str or date): The start date of the date range.
+            end_date (str or date): The end date of the date range.
+
+        Returns:
+            list: The free rooms, in the order given.
+        """
+        start, end = to_ordinal(start_date), to_ordinal(end_date)
+        return [room for room in room_numbers
+                if room not in self.rooms or self.rooms[room].is_free(start, end)]
+
+    def occupancy(self, start_date, end_date):
+        """
+        Returns the number of reserved rooms of every night of a date range.
+
+        Args:
+            start_date (str or date): The first night.
+            end_date (str or date): The day after the last night.
+
+        Returns:
+            list: (date, reserved rooms) tuples, with the date as an ISO string.
+        """
+        return [(date.fromordinal(night).isoformat(), self.occupied.get(night, 0))
+                for night in range(to_ordinal(start_date), to_ordinal(end_date))]
@@ -1,42 +1,43 @@
 """ Module to represent a customer with a name and address."""
-import json
+from storage import JsonStorage
 
 class Customer:
-    """ Class to represent a customer with a name and address."""
+    """
+    Class to represent a customer with a name and address.
 
-    def __init__(self, name, address="123 Main St"):
+    The id is the stable ID of the customer in the storage, set once the
+    customer is loaded or saved.
+    """
+
+    def __init__(self, name, address="123 Main St", storage=None):
         """
         Initializes a Customer object with the given name and address.
 
         Args:
             name (str): The name of the customer.
             address (str): The address of the customer.
+            storage (optional): The storage backend. Defaults to JSON files,
+                whose customer registry is shared by every customer.
         """
+        self.id = None
         self.name = name
         self.address = address
+        self.storage = JsonStorage() if storage is None else storage
 
     def load_information(self):
         """
-        Loads the customer information from the JSON file.
+        Loads the customer information from the storage.
         """
-        try:
-            with open('customers.json', "r",encoding='utf-8') as file:
-                data = json.load(file)
-                self.name = data.get("name", self.name)
-                self.address = data.get("address", self.address)
-        except FileNotFoundError:
-            pass
+        self.storage.load_customer(self)
 
-    def save_information(self):
+    def save_information(self, previous_name=None):
         """
-        Saves the customer information to the JSON file.
+        Saves the customer information to the storage.
+
+        Args:
+            previous_name (str, optional): The name the customer was saved under, if it changed.
         """
-        data = {
-            "name": self.name,
-            "address": self.address
-        }
-        with open('customers.json', "w",encoding='utf-8') as file:
-            json.dump(data, file)
+        self.storage.save_customer(self, previous_name)
 
     def display_information(self):
         """
@@ -54,16 +55,18 @@ class Customer:
             name (str, optional): The new name of the customer. Defaults to None.
             address (str, optional): The new address of the customer. Defaults to None.
         """
+        previous_name = self.name
         if name:
             self.name = name
         if address:
             self.address = address
-        self.save_information()
+        self.save_information(previous_name)
 
     def delete_customer(self):
         """
         Deletes the customer by setting the name and address to None.
         """
+        previous_name = self.name
         self.name = None
         self.address = None
-        self.save_information()
+        self.save_information(previous_name)
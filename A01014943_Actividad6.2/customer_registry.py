@@ -0,0 +1,271 @@
+""" Module to keep many customers, indexed by ID and by name. """
+import json
+import os
+from contextlib import contextmanager
+from journal import COMPACTION_THRESHOLD, Journal, file_lock, file_stamp
+
+
+def registry_journal_filename(filename):
+    """
+    Returns the name of the journal file of a customer file.
+    """
+    return f'{os.path.splitext(filename)[0]}_journal.jsonl'
+
+
+def registry_lock_filename(filename):
+    """
+    Returns the name of the lock file of a customer file.
+    """
+    return f'{os.path.splitext(filename)[0]}.lock'
+
+
+class CustomerRegistry:
+    """
+    Represents the customers of the hotels, each with a stable ID.
+
+    The customer file is only read the first time a customer is needed. After
+    that, lookups by ID or by name are dictionary lookups, and every change
+    is appended to a journal instead of rewriting the file; the journal is
+    compacted into the file after COMPACTION_THRESHOLD changes. Before every
+    lookup only the journal events appended by other processes are read, and
+    the file is read again only if another process compacted it. Changes and
+    compactions hold the lock file of the registry, so processes sharing the
+    file never hand out the same customer ID.
+
+    Attributes:
+        filename (str): The name of the customer file.
+        journal (Journal): The journal of the changes made since the file was saved.
+        customers (dict): The customer record of every customer ID, or None until loaded.
+        by_name (dict): The IDs of the customers with every name, in the order they were added.
+        next_id (int): The ID of the next customer.
+        journal_entries (int): The number of changes in the journal.
+        file_stamp: The stamp of the customer file when it was read.
+        journal_offset (int): The offset of the journal up to which its events were read.
+    """
+
+    _shared = {}
+
+    @classmethod
+    def shared(cls, filename='customers.json'):
+        """
+        Returns the registry of a customer file shared by the whole process.
+
+        Args:
+            filename (str): The name of the customer file.
+
+        Returns:
+            CustomerRegistry: The same registry for every call with the same file.
+        """
+        key = os.path.abspath(filename)
+        if key not in cls._shared:
+            cls._shared[key] = cls(filename)
+        return cls._shared[key]
+
+    def __init__(self, filename='customers.json'):
+        """
+        Initializes a registry backed by the given customer file, without reading it.
+
+        Args:
+            filename (str): The name of the customer file.
+        """
+        self.filename = filename
+        self.journal = Journal(registry_journal_filename(filename))
+        self.customers = None
+        self.by_name = {}
+        self.next_id = 1
+        self.journal_entries = 0
+        self.file_stamp = None
+        self.journal_offset = 0
+        self._locked = False
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Holds the lock file of the registry during the block. Nested blocks share the lock.
+        """
+        if self._locked:
+            yield
+            return
+        self._locked = True
+        try:
+            with file_lock(registry_lock_filename(self.filename)):
+                yield
+        finally:
+            self._locked = False
+
+    def _load(self):
+        """
+        Brings the registry up to date with the customer file and its journal.
+
+        The file is read the first time it is needed and after another process
+        compacted it; otherwise only the new journal events are read.
+        """
+        stamp = file_stamp(self.filename)
+        if self.customers is None or stamp != self.file_stamp:
+            self._read(stamp)
+            return
+        journal_stamp = file_stamp(self.journal.filename)
+        if (journal_stamp[2] if journal_stamp else 0) != self.journal_offset:
+            events, self.journal_offset = self.journal.read_from(self.journal_offset)
+            for event in events:
+                self._apply(event)
+            self.journal_entries += len(events)
+
+    def _read(self, stamp):
+        """
+        Reads the customer file and replays its journal.
+
+        A customer file with a single {name, address} object, as written before
+        the registry existed, is read as customer 1.
+        """
+        self.customers = {}
+        self.by_name = {}
+        self.next_id = 1
+        self.file_stamp = stamp
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as file:
+                text = file.read()
+        except FileNotFoundError:
+            text = ''
+        data = json.loads(text) if text.strip() else {}
+        if 'customers' in data:
+            records = data['customers']
+            self.next_id = data.get('next_id', 1)
+        elif data:
+            records = [{'id': 1, 'name': data.get('name'), 'address': data.get('address')}]
+        else:
+            records = []
+        for record in records:
+            self._put(record)
+        events, self.journal_offset = self.journal.read_from(0)
+        for event in events:
+            self._apply(event)
+        self.journal_entries = len(events)
+
+    def _put(self, record):
+        """
+        Adds or replaces a customer record and indexes it.
+        """
+        self._drop(record['id'])
+        self.customers[record['id']] = record
+        self.by_name.setdefault(record['name'], []).append(record['id'])
+        self.next_id = max(self.next_id, record['id'] + 1)
+
+    def _drop(self, customer_id):
+        """
+        Removes a customer record and its index entry, if it exists.
+        """
+        record = self.customers.pop(customer_id, None)
+        if record is not None:
+            ids = self.by_name[record['name']]
+            ids.remove(customer_id)
+            if not ids:
+                del self.by_name[record['name']]
+        return record
+
+    def _apply(self, event):
+        """
+        Applies a journal event to the registry.
+        """
+        if event.get('event') == 'put':
+            self._put(event['customer'])
+        elif event.get('event') == 'delete':
+            self._drop(event['id'])
+
+    def _record(self, event):
+        """
+        Applies a change, appends it to the journal and compacts the journal when it is long.
+
+        Must be called under the lock, right after the registry was brought up to date.
+        """
+        self._apply(event)
+        self.journal.append(event)
+        journal_stamp = file_stamp(self.journal.filename)
+        self.journal_offset = journal_stamp[2] if journal_stamp else 0
+        self.journal_entries += 1
+        if self.journal_entries >= COMPACTION_THRESHOLD:
+            self.save()
+
+    def __len__(self):
+        self._load()
+        return len(self.customers)
+
+    def __iter__(self):
+        self._load()
+        return iter(list(self.customers.values()))
+
+    def get(self, customer_id):
+        """
+        Returns the customer record with the given ID, or None if there is none.
+        """
+        self._load()
+        return self.customers.get(customer_id)
+
+    def find(self, name):
+        """
+        Returns the first customer record added with the given name, or None if there is none.
+        """
+        self._load()
+        ids = self.by_name.get(name)
+        return self.customers[ids[0]] if ids else None
+
+    def customer_of(self, reservation):
+        """
+        Returns the customer record of a reservation.
+
+        Args:
+            reservation (dict or Reservation): The reservation, whose customer is a name.
+
+        Returns:
+            dict: The customer record, or None if the customer is not registered.
+        """
+        customer = reservation['customer'] if isinstance(reservation, dict) else reservation.customer
+        return self.find(customer)
+
+    def add(self, name, address):
+        """
+        Registers a new customer.
+
+        Returns:
+            dict: The record of the new customer, with its ID.
+        """
+        with self._transaction():
+            self._load()
+            record = {'id': self.next_id, 'name': name, 'address': address}
+            self._record({'event': 'put', 'customer': record})
+        return record
+
+    def update(self, customer_id, name, address):
+        """
+        Changes the name and address of a registered customer.
+        """
+        with self._transaction():
+            self._load()
+            self._record({'event': 'put', 'customer': {'id': customer_id, 'name': name, 'address': address}})
+
+    def remove(self, customer_id):
+        """
+        Removes a registered customer.
+        """
+        with self._transaction():
+            self._load()
+            self._record({'event': 'delete', 'id': customer_id})
+
+    def save(self):
+        """
+        Saves every customer to the customer file and clears the journal.
+
+        The file is written to a temporary file that then replaces it.
+        """
+        with self._transaction():
+            self._load()
+            data = {'next_id': self.next_id, 'customers': list(self.customers.values())}
+            with open(f'{self.filename}.tmp', 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(f'{self.filename}.tmp', self.filename)
+            self.journal.clear()
+            self.journal_entries = 0
+            self.journal_offset = 0
+            self.file_stamp = file_stamp(self.filename)
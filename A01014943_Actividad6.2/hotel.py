@@ -1,6 +1,10 @@
 """ Module to represent a hotel with its name, address, and available rooms. """
-import json
+from contextlib import contextmanager
+from availability_index import AvailabilityIndex
 from reservation import create_reservation
+from reservation_book import ReservationBook
+from rooms import RoomSet
+from storage import JsonStorage
 
 
 class Hotel:
@@ -10,53 +14,136 @@ class Hotel:
     Attributes:
         name (str): The name of the hotel.
         address (str): The address of the hotel.
-        rooms (list): A list of room numbers available in the hotel.
-        reservations (list): A list of reservations made in the hotel.
+        rooms (RoomSet): The rooms of the hotel. Reservations do not change them.
+        reservations (ReservationBook): The reservations made in the hotel, keyed by ID.
+            With a storage that loads reservations lazily, only those paged in so far.
+        next_id (int): The ID of the next reservation, or None until it is first needed.
+        availability_index (AvailabilityIndex): The in-memory index of the
+            reserved date ranges of every room, built on first use.
+        storage (JsonStorage or SqliteStorage): Where the hotel is persisted.
+        version: The version stamp of the stored hotel when it was loaded, or
+            when the availability index or the ID counter were last read from
+            the storage. None until then.
+        loaded (bool): True if the hotel was loaded from the storage.
     """
 
-    def __init__(self, name, address, rooms=None):
+    def __init__(self, name, address, rooms=None, storage=None):
         """
         Initializes a Hotel object with the given name, address, and rooms.
 
         Args:
             name (str): The name of the hotel.
             address (str): The address of the hotel.
-            rooms (list): A list of room numbers available in the hotel.
+            rooms (list): The numbers of the rooms of the hotel.
+            storage (optional): The storage backend. Defaults to JSON files.
         """
         self.name = name
         self.address = address
-        self.rooms = list(range(101, 111)) if rooms is None else rooms
-        self.reservations = []
+        self.rooms = RoomSet(range(101, 111) if rooms is None else rooms)
+        self.reservations = ReservationBook()
+        self.next_id = None
         self.filename = f'hotel_{self.name}_data.json'
-
+        self.availability_index = None
+        self.storage = JsonStorage() if storage is None else storage
+        self.version = None
+        self.loaded = False
 
     def load_data(self):
         """
-        Loads hotel data from a JSON file.
-        """
-        try:
-            with open(self.filename, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                self.name = data.get('name', self.name)
-                self.address = data.get('address', self.address)
-                self.rooms = data.get('rooms', self.rooms)
-                self.reservations = data.get('reservations', [])
-                return self
-        except FileNotFoundError:
+        Loads hotel data from the storage.
+        """
+        self.version = self.storage.version(self.name)
+        if not self.storage.load(self):
             print("No existing data found. Starting with default values.")
+            return None
+        self.loaded = True
+        self.availability_index = self._build_index(self.reservations)
+        return self
+
+    def _refresh(self):
+        """
+        Brings the hotel up to date if the stored hotel changed since it was
+        loaded or since its cached data was read from the storage.
+
+        A loaded hotel is loaded again. A hotel that was not loaded drops its
+        availability index and ID counter, which are read again when needed.
+        """
+        version = self.storage.version(self.name)
+        if version == self.version:
+            return
+        if self.loaded:
+            self.load_data()
+        else:
+            self.availability_index = None
+            self.next_id = None
+        self.version = version
+
+    def _build_index(self, reservations):
+        """
+        Builds the availability index from the reservations of this hotel.
+
+        The storage only holds the reservations of this hotel, so they are not
+        filtered by name: reservations made before a rename keep counting.
+        """
+        return AvailabilityIndex(reservations)
+
+    def get_availability_index(self):
+        """
+        Returns the availability index, building it on first use.
+
+        If the hotel data has not been loaded, the index is built once from the
+        reservations in the storage, or from the reservations in memory if the
+        hotel is not stored yet.
+
+        Returns:
+            AvailabilityIndex: The availability index of the hotel.
+        """
+        if self.availability_index is None:
+            self._refresh()
+            self.availability_index = self._build_index(self.storage.stored_reservations(self))
+        return self.availability_index
+
+    @contextmanager
+    def _commit(self):
+        """
+        Runs a change of the reservations of the hotel under the storage lock.
+
+        The version of the stored hotel is checked first. If another process
+        changed it since it was loaded or read, the hotel is refreshed and the
+        change is validated against the current data instead.
+        """
+        with self.storage.transaction(self.name):
+            self._refresh()
+            yield
+            self.version = self.storage.version(self.name)
+
+    def allocate_reservation_id(self):
+        """
+        Returns a new reservation ID from the in-memory ID counter.
+
+        The counter is read from the storage only the first time it is needed
+        by a hotel that was not loaded.
+
+        Returns:
+            int: The ID of the new reservation.
+        """
+        if self.next_id is None:
+            self._refresh()
+            self.next_id = self.storage.next_reservation_id(self.name)
+        reservation_id = self.next_id
+        self.next_id += 1
+        return reservation_id
 
-    def save_data(self):
+    def save_data(self, previous_name=None):
         """
-        Saves hotel data to a JSON file.
+        Saves hotel data to the storage.
+
+        Args:
+            previous_name (str, optional): The name the hotel was saved under, if it changed.
         """
-        data = {
-            'name': self.name,
-            'address': self.address,
-            'rooms': self.rooms,
-            'reservations': self.reservations
-        }
-        with open(f'hotel_{self.name}_data.json', 'w',encoding='utf-8') as file:
-            json.dump(data, file)
+        with self.storage.transaction(previous_name or self.name):
+            self.storage.save(self, previous_name)
+            self.version = self.storage.version(self.name)
 
     def display_information(self):
         """
@@ -71,7 +158,7 @@ class Hotel:
         information += f"Address: {self.address}\n"
         information += f"Number of Rooms: {len(self.rooms)}\n"
         information += f"Available Rooms: {self.rooms}\n"
-        information += f"Number of Reservations: {len(self.reservations)}\n"
+        information += f"Number of Reservations: {self.storage.count_reservations(self)}\n"
         return information
 
     def modify_information(self, name=None, address=None):
@@ -82,16 +169,20 @@ class Hotel:
             name (str, optional): The new name of the hotel. Defaults to None.
             address (str, optional): The new address of the hotel. Defaults to None.
         """
+        previous_name = self.name
         if name:
             self.name = name
         if address:
             self.address = address
-        self.save_data()
+        self.save_data(previous_name)
 
     def reserve_room(self, room_number, guest_name, start_date, end_date):
         """
         Reserves a room in the hotel for a guest.
 
+        The availability check and the booking run in one storage transaction,
+        against the current data of the hotel if another process changed it.
+
         Args:
             room_number (int): The number of the room to be reserved.
             guest_name (str): The name of the guest.
@@ -99,19 +190,78 @@ class Hotel:
         Returns:
             None
         """
-        if room_number in self.rooms and self.verify_room_availability(room_number, start_date, end_date):
-            reservation = create_reservation(guest_name, self.name, room_number, start_date, end_date)
-            self.reservations.append(reservation.to_dict())
-            self.rooms.remove(room_number)
-            print(f"Room {room_number} reserved for {guest_name}.")
-            self.save_data()
-        else:
-            print(f"Room {room_number} is not available.")
+        with self._commit():
+            if room_number in self.rooms and self.verify_room_availability(room_number, start_date, end_date):
+                reservation = create_reservation(guest_name, self.name, room_number, start_date, end_date,
+                                                 self.allocate_reservation_id())
+                self.reservations.append(reservation)
+                if self.availability_index is not None:
+                    self.availability_index.add(reservation)
+                print(f"Room {room_number} reserved for {guest_name}.")
+                self.storage.add_reservation(self, reservation)
+            else:
+                print(f"Room {room_number} is not available.")
+
+    def reserve_rooms(self, bookings):
+        """
+        Reserves several rooms at once, for example for a group booking.
+
+        Every booking is checked against the rooms and reservations in memory,
+        and against the other bookings of the batch, before any of them is
+        made; later bookings are not checked against an unavailable one.
+        Either all of them are reserved and saved with a single storage
+        write, or none is.
+
+        Args:
+            bookings (iterable): (room_number, guest_name, start_date, end_date) tuples.
+
+        Returns:
+            list: One dictionary per booking, in order, with its room_number,
+                guest_name, start_date, end_date, its status ('reserved',
+                'unavailable', or 'not reserved' when another booking of the
+                batch was unavailable) and its reservation, or None.
+        """
+        results = []
+        batch = AvailabilityIndex()
+        with self._commit():
+            for room_number, guest_name, start_date, end_date in bookings:
+                available = (room_number in self.rooms
+                             and batch.is_available(room_number, start_date, end_date)
+                             and self.verify_room_availability(room_number, start_date, end_date))
+                if available:
+                    batch.add({'id': len(results), 'room_number': room_number,
+                               'start_date': start_date, 'end_date': end_date})
+                results.append({'room_number': room_number, 'guest_name': guest_name,
+                                'start_date': start_date, 'end_date': end_date,
+                                'status': 'not reserved' if available else 'unavailable',
+                                'reservation': None})
+            if not results:
+                return results
+            unavailable = [r['room_number'] for r in results if r['status'] == 'unavailable']
+            if unavailable:
+                print(f"Rooms {unavailable} are not available. No room was reserved.")
+                return results
+            for result in results:
+                reservation = create_reservation(result['guest_name'], self.name, result['room_number'],
+                                                 result['start_date'], result['end_date'],
+                                                 self.allocate_reservation_id())
+                self.reservations.append(reservation)
+                if self.availability_index is not None:
+                    self.availability_index.add(reservation)
+                result['status'] = 'reserved'
+                result['reservation'] = reservation
+            print(f"{len(results)} rooms reserved.")
+            self.storage.add_reservations(self, [result['reservation'] for result in results])
+        return results
 
     def verify_room_availability(self, room_number, start_date, end_date):
         """
         Checks the availability of a room within a specified date range.
 
+        With the JSON storage the check is a binary search in the availability
+        index and does not read the hotel data file once the index is built;
+        the SQLite storage answers it with an indexed range query.
+
         Args:
             room_number (int): The number of the room to check availability for.
             start_date (str): The start date of the date range to check.
@@ -120,35 +270,56 @@ class Hotel:
         Returns:
             bool: True if the room is available, False otherwise.
         """
-        availability = True
-        try:
-            with open(self.filename, 'r', encoding='utf-8') as file:
-                hotel_data = json.load(file)
-            for reservation in hotel_data['reservations']:
-                if reservation['room_number'] == room_number and reservation['hotel'] == self.name and reservation['start_date'] < end_date and reservation['end_date'] > start_date:
-                    availability = False
-        except FileNotFoundError:
-            return availability
-        return availability
+        return self.storage.is_available(self, room_number, start_date, end_date)
+
+    def find_free_rooms(self, start_date, end_date):
+        """
+        Returns the rooms of the hotel that are free for a whole date range.
+
+        Args:
+            start_date (str or date): The start date of the date range.
+            end_date (str or date): The end date of the date range.
+
+        Returns:
+            list: The free room numbers, in ascending order.
+        """
+        self.storage.load_range(self, start_date, end_date)
+        return self.get_availability_index().free_rooms(sorted(self.rooms), start_date, end_date)
+
+    def get_occupancy(self, start_date, end_date):
+        """
+        Returns the number of reserved rooms of the hotel on every night of a date range.
+
+        Args:
+            start_date (str or date): The first night.
+            end_date (str or date): The day after the last night.
+
+        Returns:
+            list: (date, reserved rooms) tuples, with the date as an ISO string.
+        """
+        self.storage.load_range(self, start_date, end_date)
+        return self.get_availability_index().occupancy(start_date, end_date)
 
     def cancel_reservation(self, reservation_id):
         """
         Cancels a reservation for a room in the hotel.
 
         Args:
-            room_number (int): The number of the room for which the reservation is to be cancelled.
+            reservation_id (int): The ID of the reservation to be cancelled.
 
         Returns:
             None
         """
-        for reservation in self.reservations:
-            if reservation['id'] == reservation_id:
-                self.reservations.remove(reservation)
-                self.rooms.append(reservation['room_number'])
-                print(f"Reservation {reservation_id} for {reservation['customer']} cancelled.")
-                self.save_data()
+        with self._commit():
+            self.storage.load_reservation(self, reservation_id)
+            reservation = self.reservations.pop(reservation_id)
+            if reservation is None:
+                print(f"No reservation found for ID {reservation_id}.")
                 return
-        print(f"No reservation found for ID {reservation_id}.")
+            if self.availability_index is not None:
+                self.availability_index.remove(reservation)
+            print(f"Reservation {reservation_id} for {reservation['customer']} cancelled.")
+            self.storage.remove_reservation(self, reservation)
 
     def delete_hotel(self):
         """
@@ -157,8 +328,10 @@ class Hotel:
         Returns:
             None
         """
+        previous_name = self.name
         self.name = None
         self.address = None
-        self.rooms = []
-        self.reservations = []
-        self.save_data()
+        self.rooms = RoomSet()
+        self.reservations = ReservationBook()
+        self.availability_index = AvailabilityIndex()
+        self.save_data(previous_name)
@@ -0,0 +1,191 @@
+""" Module with append-only journals of events, such as the reservation events of a hotel. """
+import json
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Number of journal events after which the journaled data is compacted into a snapshot.
+COMPACTION_THRESHOLD = 1000
+
+
+def file_stamp(filename):
+    """
+    Returns the inode, modification time and size of a file, or None if it does not exist.
+    """
+    try:
+        status = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return status.st_ino, status.st_mtime_ns, status.st_size
+
+
+@contextmanager
+def file_lock(filename):
+    """
+    Holds an exclusive advisory lock on a lock file during the block.
+
+    No lock is taken where fcntl is not available.
+
+    Args:
+        filename (str): The name of the lock file, created if needed.
+    """
+    if fcntl is None:
+        yield
+        return
+    descriptor = os.open(filename, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(descriptor)
+
+
+def journal_filename(hotel_name):
+    """
+    Returns the name of the journal file of a hotel.
+
+    Args:
+        hotel_name (str): The name of the hotel.
+
+    Returns:
+        str: The name of the journal file.
+    """
+    return f'hotel_{hotel_name}_journal.jsonl'
+
+
+class Journal:
+    """
+    Represents an append-only journal of events, such as the reservation
+    events of a hotel or the changes of the customer registry.
+
+    Every event is one JSON object per line, flushed and fsynced before the
+    append returns, so a change costs one small write instead of a rewrite
+    of the whole data file.
+
+    Attributes:
+        filename (str): The name of the journal file.
+    """
+
+    def __init__(self, filename):
+        """
+        Initializes a Journal object for the given file.
+
+        Args:
+            filename (str): The name of the journal file.
+        """
+        self.filename = filename
+
+    def append(self, event):
+        """
+        Appends an event to the journal and forces it to disk.
+
+        Args:
+            event (dict): The event to append.
+        """
+        self.extend([event])
+
+    def extend(self, events):
+        """
+        Appends several events to the journal in one write and forces them to disk.
+
+        Args:
+            events (list): The events to append.
+        """
+        with open(self.filename, 'a', encoding='utf-8') as file:
+            file.write(''.join(json.dumps(event) + '\n' for event in events))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def read(self):
+        """
+        Reads the events of the journal.
+
+        Reading stops at the first line that is not valid JSON, which is how a
+        write interrupted by a crash shows up.
+
+        Returns:
+            list: The events of the journal, oldest first.
+        """
+        return self.read_from(0)[0]
+
+    def read_from(self, offset):
+        """
+        Reads the events of the journal written after a byte offset.
+
+        Args:
+            offset (int): The offset to read from, as returned by an earlier read.
+
+        Returns:
+            tuple: The events, oldest first, and the offset after the last of them.
+        """
+        events = []
+        try:
+            with open(self.filename, 'rb') as file:
+                file.seek(offset)
+                for line in file:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+        return events, offset
+
+    def clear(self):
+        """
+        Removes the journal once its events are part of a snapshot.
+        """
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
+
+
+def reserve_event(reservation):
+    """
+    Returns the journal event of a new reservation.
+    """
+    return {'event': 'reserve', 'reservation': dict(reservation)}
+
+
+def cancel_event(reservation):
+    """
+    Returns the journal event of a cancelled reservation.
+    """
+    return {'event': 'cancel', 'id': reservation['id'], 'room_number': reservation['room_number']}
+
+
+def apply_event(event, reservations):
+    """
+    Applies a journal event to the reservations of a hotel.
+
+    Events are applied by reservation ID and are idempotent, so replaying
+    events that are already part of the snapshot has no effect. A reserve
+    event for a different reservation with an ID that is already taken is
+    kept under the next free ID.
+
+    Args:
+        event (dict): The event to apply.
+        reservations (ReservationBook): The reservations to update.
+
+    Returns:
+        int: The ID of the reservation of a reserve event, or None.
+    """
+    if event['event'] == 'cancel':
+        reservations.pop(event['id'])
+        return None
+    reservation = event['reservation']
+    existing = reservations.get(reservation['id'])
+    if existing is not None:
+        if existing == reservation:
+            return reservation['id']
+        print(f"Reservation ID {reservation['id']} is already taken; "
+              f"keeping the reservation of {reservation['customer']} as ID {reservations.next_id()}.")
+        reservation = dict(reservation, id=reservations.next_id())
+    reservations.append(reservation)
+    return reservation['id']
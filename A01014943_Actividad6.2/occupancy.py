@@ -0,0 +1,55 @@
+""" Module to search availability and occupancy across several hotels. """
+import calendar
+from datetime import date, timedelta
+
+
+def month_range(year, month):
+    """
+    Returns the first day of a month and the first day of the next month.
+
+    Args:
+        year (int): The year.
+        month (int): The month, from 1 to 12.
+
+    Returns:
+        tuple: The two dates as ISO strings, usable as a date range.
+    """
+    days = calendar.monthrange(year, month)[1]
+    return date(year, month, 1).isoformat(), (date(year, month, days) + timedelta(days=1)).isoformat()
+
+
+def find_free_rooms(hotels, start_date, end_date):
+    """
+    Returns the rooms of several hotels that are free for a whole date range.
+
+    Args:
+        hotels (iterable): The Hotel objects to search.
+        start_date (str or date): The start date of the date range.
+        end_date (str or date): The end date of the date range.
+
+    Returns:
+        dict: The free room numbers of every hotel, by hotel name.
+    """
+    return {hotel.name: hotel.find_free_rooms(start_date, end_date) for hotel in hotels}
+
+
+def get_occupancy(hotels, start_date, end_date):
+    """
+    Returns the number of reserved rooms on every night of a date range, for several hotels.
+
+    Args:
+        hotels (iterable): The Hotel objects to report on.
+        start_date (str or date): The first night.
+        end_date (str or date): The day after the last night.
+
+    Returns:
+        dict: The (date, reserved rooms) tuples of every hotel, by hotel name.
+    """
+    return {hotel.name: hotel.get_occupancy(start_date, end_date) for hotel in hotels}
+
+
+def get_monthly_occupancy(hotels, year, month):
+    """
+    Returns the number of reserved rooms on every night of a month, for several hotels.
+    """
+    return get_occupancy(hotels, *month_range(year, month))
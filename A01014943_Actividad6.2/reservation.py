@@ -1,26 +1,85 @@
 """Module to represent a reservation made by a customer at a hotel."""
-import json
+from datetime import date
+from sys import intern
+
+
+def to_ordinal(day):
+    """
+    Returns a date given as an ISO string, a datetime.date or an ordinal as an ordinal.
+    """
+    if isinstance(day, int):
+        return day
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    return day.toordinal()
+
 
 class Reservation:
     """
     Represents a reservation made by a customer at a hotel.
 
+    Reservations are compact: their attributes are slots, the dates are kept
+    as date ordinals and the customer and hotel names are interned, so the
+    many reservations of a hotel share the same name strings. A reservation
+    can be read like the dictionary returned by to_dict, which is only built
+    where a reservation is written to a file.
+
     Attributes:
         customer (Customer): The customer making the reservation.
         hotel (Hotel): The hotel where the reservation is made.
         room_number (int): The room number for the reservation.
         ID (int): The ID of the reservation.
-        start_date (str): The start date of the reservation.
-        end_date (str): The end date of the reservation.
+        start (int): The ordinal of the start date of the reservation.
+        end (int): The ordinal of the end date of the reservation.
     """
+    __slots__ = ('id', 'customer', 'hotel', 'room_number', 'start', 'end')
 
-    def __init__(self, customer, hotel, room_number, start_date, end_date):
-        self.hotel = hotel
-        self.id = self.get_next_id()
-        self.customer = customer
+    KEYS = ('id', 'customer', 'hotel', 'room_number', 'start_date', 'end_date')
+
+    def __init__(self, customer, hotel, room_number, start_date, end_date, reservation_id=None):
+        self.hotel = intern(hotel) if isinstance(hotel, str) else hotel
+        self.id = self.get_next_id() if reservation_id is None else reservation_id
+        self.customer = intern(customer) if isinstance(customer, str) else customer
         self.room_number = room_number
-        self.start_date = start_date
-        self.end_date = end_date
+        self.start = to_ordinal(start_date)
+        self.end = to_ordinal(end_date)
+
+    @classmethod
+    def from_dict(cls, data):
+        """ Returns the reservation of a dictionary as produced by to_dict. """
+        return cls(data['customer'], data['hotel'], data['room_number'],
+                   data['start_date'], data['end_date'], data['id'])
+
+    @property
+    def start_date(self):
+        """ The start date of the reservation, as an ISO string. """
+        return date.fromordinal(self.start).isoformat()
+
+    @property
+    def end_date(self):
+        """ The end date of the reservation, as an ISO string. """
+        return date.fromordinal(self.end).isoformat()
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self):
+        """ Returns the keys of the dictionary representation of the reservation. """
+        return self.KEYS
+
+    def __eq__(self, other):
+        if isinstance(other, Reservation):
+            return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_dict())
 
     def to_dict(self):
         """ Returns a dictionary representation of the reservation. """
@@ -40,18 +99,9 @@ class Reservation:
         Returns:
             int: The next available ID for a reservation.
         """
-        filename = filename if filename else f'hotel_{self.hotel}_data.json'
-
-        try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                hotel_data = json.load(file)
-                reservations = hotel_data.get('reservations', [])
-                if reservations:
-                    return reservations[-1]['id'] + 1
-                else:
-                    return 1
-        except FileNotFoundError:
-            return 1
+        # Imported here because the storage module builds reservations itself.
+        from storage import JsonStorage  # pylint: disable=import-outside-toplevel
+        return JsonStorage().next_reservation_id(self.hotel, filename)
 
     def print_reservation_details(self):
         """
@@ -68,8 +118,8 @@ class Reservation:
         details += f"End Date: {self.end_date}\n"
         return details
 
-def create_reservation(customer, hotel, room_number, start_date, end_date):
+def create_reservation(customer, hotel, room_number, start_date, end_date, reservation_id=None):
     """ Creates a reservation and saves it to the JSON file."""
-    r = Reservation(customer, hotel, room_number, start_date, end_date)
+    r = Reservation(customer, hotel, room_number, start_date, end_date, reservation_id)
     #r.save_reservation_json()
     return r
@@ -0,0 +1,74 @@
+""" Module to keep the reservations of a hotel keyed by their ID. """
+from reservation import Reservation
+
+
+class ReservationBook:
+    """
+    Represents the reservations of a hotel, keyed by ID in the order they were made.
+
+    The book holds compact Reservation objects. It iterates and compares like
+    the list of reservation dictionaries it replaces, but finding, adding and
+    removing a reservation by ID is a single dictionary operation.
+
+    Attributes:
+        by_id (dict): The Reservation of every reservation ID.
+    """
+
+    def __init__(self, reservations=()):
+        """
+        Initializes the book with the given reservations or reservation dictionaries.
+        """
+        self.by_id = {}
+        for reservation in reservations:
+            self.append(reservation)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, reservation):
+        return self.by_id.get(reservation['id']) == reservation
+
+    def __eq__(self, other):
+        if isinstance(other, ReservationBook):
+            return list(self.by_id.items()) == list(other.by_id.items())
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def get(self, reservation_id):
+        """
+        Returns the reservation with the given ID, or None if there is none.
+        """
+        return self.by_id.get(reservation_id)
+
+    def append(self, reservation):
+        """
+        Adds a reservation, or a reservation dictionary, to the book.
+        """
+        if not isinstance(reservation, Reservation):
+            reservation = Reservation.from_dict(reservation)
+        self.by_id[reservation.id] = reservation
+
+    def remove(self, reservation):
+        """
+        Removes a reservation from the book.
+        """
+        del self.by_id[reservation['id']]
+
+    def pop(self, reservation_id):
+        """
+        Removes and returns the reservation with the given ID, or None if there is none.
+        """
+        return self.by_id.pop(reservation_id, None)
+
+    def next_id(self):
+        """
+        Returns the ID after the highest ID in the book.
+        """
+        return max(self.by_id, default=0) + 1
@@ -0,0 +1,94 @@
+""" Module to keep the rooms of a hotel, independently of their reservations. """
+
+
+class Room:
+    """
+    Represents a room of a hotel.
+
+    Attributes:
+        number (int): The number of the room.
+        in_service (bool): False while the room cannot be reserved, for example during repairs.
+    """
+    __slots__ = ('number', 'in_service')
+
+    def __init__(self, number, in_service=True):
+        self.number = number
+        self.in_service = in_service
+
+
+class RoomSet:
+    """
+    Represents the rooms of a hotel, keyed by room number.
+
+    Reservations do not change the rooms of a hotel; whether a room is free
+    on given dates is answered by the availability index. The set iterates
+    and compares like the list of the numbers of the rooms in service, and
+    looking a room up is a single dictionary operation.
+
+    Attributes:
+        by_number (dict): The Room of every room number, in the order they were added.
+    """
+
+    def __init__(self, room_numbers=(), out_of_service=()):
+        """
+        Initializes the set with the given rooms.
+
+        Args:
+            room_numbers (iterable): The numbers of the rooms.
+            out_of_service (iterable): The numbers of the rooms that are not in service.
+        """
+        self.by_number = {number: Room(number) for number in room_numbers}
+        for number in out_of_service:
+            self.set_in_service(number, False)
+
+    def __iter__(self):
+        return (room.number for room in self.by_number.values() if room.in_service)
+
+    def __len__(self):
+        return len(self.by_number)
+
+    def __contains__(self, room_number):
+        room = self.by_number.get(room_number)
+        return room is not None and room.in_service
+
+    def __eq__(self, other):
+        if isinstance(other, RoomSet):
+            return self.numbers() == other.numbers() and self.out_of_service() == other.out_of_service()
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def add(self, room_number):
+        """
+        Adds a room to the set, if it is not there yet.
+        """
+        if room_number not in self.by_number:
+            self.by_number[room_number] = Room(room_number)
+
+    def remove(self, room_number):
+        """
+        Removes a room from the set.
+        """
+        del self.by_number[room_number]
+
+    def set_in_service(self, room_number, in_service):
+        """
+        Puts a room in or out of service, adding it to the set if needed.
+        """
+        self.add(room_number)
+        self.by_number[room_number].in_service = in_service
+
+    def numbers(self):
+        """
+        Returns the numbers of all rooms, in or out of service.
+        """
+        return list(self.by_number)
+
+    def out_of_service(self):
+        """
+        Returns the numbers of the rooms that are out of service.
+        """
+        return [room.number for room in self.by_number.values() if not room.in_service]
@@ -0,0 +1,851 @@
+""" Module with the storage backends of hotels, reservations and customers. """
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date
+from journal import (COMPACTION_THRESHOLD, Journal, apply_event, cancel_event, file_lock,
+                     file_stamp, journal_filename, reserve_event)
+from customer_registry import CustomerRegistry
+from reservation import Reservation, to_ordinal
+from reservation_book import ReservationBook
+from rooms import RoomSet
+
+
+def lock_filename(hotel_name):
+    """
+    Returns the name of the lock file of a hotel.
+    """
+    return f'hotel_{hotel_name}.lock'
+
+
+def read_json(filename):
+    """
+    Returns the data of a JSON file, or None if the file does not exist.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_json(filename, data):
+    """
+    Writes data to a JSON file through a temporary file that then replaces it,
+    so readers see either the old or the new file, never a partial one.
+    """
+    with open(f'{filename}.tmp', 'w',encoding='utf-8') as file:
+        json.dump(data, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f'{filename}.tmp', filename)
+
+
+def migrate_rooms(hotel, reservations, events):
+    """
+    Gives back to a hotel saved before reservations stopped removing rooms
+    the rooms of its reservations and of the events of its journal.
+    """
+    numbers = set(hotel.rooms.numbers())
+    numbers.update(reservation['room_number'] for reservation in reservations)
+    numbers.update(event['reservation']['room_number'] if event['event'] == 'reserve'
+                   else event['room_number'] for event in events)
+    hotel.rooms = RoomSet(sorted(numbers), hotel.rooms.out_of_service())
+
+
+def rename_reservations(hotel):
+    """
+    Writes the current name of a renamed hotel into all of its reservations.
+    """
+    for reservation in hotel.reservations:
+        reservation.hotel = hotel.name
+
+
+class JsonStorage:
+    """
+    Stores every hotel in its own JSON file and the customers in a customer registry.
+
+    Reservation changes made since a hotel file was last saved are kept in the
+    append-only journal of the hotel. Processes sharing the files serialize
+    their changes with an advisory lock on the lock file of the hotel. This
+    is the default storage.
+
+    Attributes:
+        customers_filename (str): The name of the customer file.
+        customers (CustomerRegistry): The customers, shared with every storage using the same file.
+        journal_entries (dict): The number of events in the journal of every hotel.
+    """
+
+    def __init__(self, customers_filename='customers.json'):
+        self.customers_filename = customers_filename
+        self.customers = CustomerRegistry.shared(customers_filename)
+        self.journal_entries = {}
+        self._locks = set()
+
+    @contextmanager
+    def transaction(self, hotel_name=None):
+        """
+        Holds the exclusive advisory lock of a hotel during the block.
+
+        Nested blocks for the same hotel share the lock. No lock is taken where
+        fcntl is not available.
+
+        Args:
+            hotel_name (str, optional): The name of the hotel to lock.
+        """
+        if hotel_name is None or hotel_name in self._locks:
+            yield
+            return
+        self._locks.add(hotel_name)
+        try:
+            with file_lock(lock_filename(hotel_name)):
+                yield
+        finally:
+            self._locks.discard(hotel_name)
+
+    def version(self, hotel_name):
+        """
+        Returns the version stamp of a stored hotel.
+
+        The stamp is the inode, modification time and size of the data file and
+        of the journal, which change with every save and every journal append,
+        so it is checked without reading either file.
+
+        Args:
+            hotel_name (str): The name of the hotel.
+
+        Returns:
+            tuple: The version stamp.
+        """
+        return file_stamp(f'hotel_{hotel_name}_data.json'), file_stamp(journal_filename(hotel_name))
+
+    def load(self, hotel):
+        """
+        Loads a hotel from its JSON file and replays its journal on top of it.
+
+        Args:
+            hotel (Hotel): The hotel to load, updated in place.
+
+        Returns:
+            bool: True if any data was found, False otherwise.
+        """
+        data = read_json(hotel.filename)
+        if data is not None:
+            self._load_data(hotel, data)
+        events = Journal(journal_filename(hotel.name)).read()
+        for event in events:
+            self._replay(hotel, event)
+        if data is not None and 'out_of_service' not in data:
+            migrate_rooms(hotel, data.get('reservations', []), events)
+        self.journal_entries[hotel.name] = len(events)
+        return data is not None or bool(events)
+
+    def _load_data(self, hotel, data):
+        """
+        Updates a hotel with the data of its JSON file.
+        """
+        hotel.name = data.get('name', hotel.name)
+        hotel.address = data.get('address', hotel.address)
+        if 'rooms' in data:
+            hotel.rooms = RoomSet(data['rooms'], data.get('out_of_service', []))
+        hotel.reservations = ReservationBook(data.get('reservations', []))
+        hotel.next_id = data.get('next_id', hotel.reservations.next_id())
+
+    def _replay(self, hotel, event):
+        """
+        Applies an event of the journal of a hotel to the hotel.
+        """
+        reservation_id = apply_event(event, hotel.reservations)
+        if reservation_id is not None:
+            hotel.next_id = max(hotel.next_id or 1, event['reservation']['id'] + 1, reservation_id + 1)
+
+    def _saved_reservations(self, data):
+        """
+        Returns every reservation dictionary of the data of a hotel file.
+        """
+        return data.get('reservations', [])
+
+    def stored_reservations(self, hotel):
+        """
+        Returns the reservations saved for a hotel, or the reservations in
+        memory if there is no file yet.
+        """
+        data = read_json(hotel.filename)
+        reservations = ReservationBook(hotel.reservations if data is None else self._saved_reservations(data))
+        for event in Journal(journal_filename(hotel.name)).read():
+            apply_event(event, reservations)
+        return reservations
+
+    def load_range(self, hotel, start_date, end_date):  # pylint: disable=unused-argument
+        """
+        Loads the reservations of a hotel that overlap a date range. A loaded
+        hotel already holds all of them.
+        """
+
+    def load_reservation(self, hotel, reservation_id):  # pylint: disable=unused-argument
+        """
+        Loads the reservation of a hotel with the given ID. A loaded hotel
+        already holds all of them.
+        """
+
+    def count_reservations(self, hotel):
+        """
+        Returns the number of reservations of a hotel.
+        """
+        return len(hotel.reservations)
+
+    def is_available(self, hotel, room_number, start_date, end_date):
+        """
+        Checks the availability of a room in the availability index of the hotel.
+        """
+        return hotel.get_availability_index().is_available(room_number, start_date, end_date)
+
+    def next_reservation_id(self, hotel_name, filename=None):
+        """
+        Gets the next available ID for a reservation of a hotel.
+
+        The ID counter saved in the hotel file is never lowered by a
+        cancellation, so IDs are not reused; files saved before the counter
+        existed continue from the ID of their last reservation.
+
+        Args:
+            hotel_name (str): The name of the hotel.
+            filename (str, optional): The hotel file to read. Defaults to the file of the hotel.
+
+        Returns:
+            int: The next available ID for a reservation.
+        """
+        filename = filename if filename else f'hotel_{hotel_name}_data.json'
+
+        next_id = 1
+        try:
+            with open(filename, 'r', encoding='utf-8') as file:
+                hotel_data = json.load(file)
+                reservations = hotel_data.get('reservations', [])
+                if reservations:
+                    next_id = reservations[-1]['id'] + 1
+                next_id = hotel_data.get('next_id', next_id)
+        except FileNotFoundError:
+            pass
+        # Reservations made since the data file was saved are only in the journal.
+        for event in Journal(journal_filename(hotel_name)).read():
+            if event['event'] == 'reserve':
+                next_id = max(next_id, event['reservation']['id'] + 1)
+        return next_id
+
+    def _record(self, hotel, events):
+        """
+        Appends reservation events to the journal of a hotel, compacting it
+        once the journal grows past COMPACTION_THRESHOLD events.
+        """
+        Journal(journal_filename(hotel.name)).extend(events)
+        self.journal_entries[hotel.name] = self.journal_entries.get(hotel.name, 0) + len(events)
+        if self.journal_entries[hotel.name] >= COMPACTION_THRESHOLD:
+            self.compact(hotel)
+
+    def compact(self, hotel):
+        """
+        Saves a hotel with its journal applied and clears the journal.
+
+        A hotel that was not loaded holds only its own reservations, so the
+        stored hotel is loaded into a new Hotel and that one is saved instead.
+
+        Args:
+            hotel (Hotel): The hotel whose journal is compacted.
+        """
+        if not hotel.loaded:
+            hotel = type(hotel)(hotel.name, hotel.address, hotel.rooms.numbers(), storage=self)
+            self.load(hotel)
+        self.save(hotel)
+
+    def add_reservation(self, hotel, reservation):
+        """
+        Records a new reservation of a hotel.
+        """
+        self._record(hotel, [reserve_event(reservation)])
+
+    def add_reservations(self, hotel, reservations):
+        """
+        Records several new reservations of a hotel in one journal write.
+        """
+        self._record(hotel, [reserve_event(reservation) for reservation in reservations])
+
+    def remove_reservation(self, hotel, reservation):
+        """
+        Records the cancellation of a reservation of a hotel.
+        """
+        self._record(hotel, [cancel_event(reservation)])
+
+    def save(self, hotel, previous_name=None):
+        """
+        Saves a hotel to its JSON file, atomically, and clears its journal.
+
+        Args:
+            hotel (Hotel): The hotel to save.
+            previous_name (str, optional): The name the hotel was saved under, if it changed.
+        """
+        if previous_name is not None and hotel.name not in (None, previous_name):
+            rename_reservations(hotel)
+        data = {
+            'name': hotel.name,
+            'address': hotel.address,
+            'rooms': hotel.rooms.numbers(),
+            'out_of_service': hotel.rooms.out_of_service(),
+            'reservations': [reservation.to_dict() for reservation in hotel.reservations],
+            'next_id': hotel.next_id if hotel.next_id is not None else hotel.reservations.next_id()
+        }
+        write_json(f'hotel_{hotel.name}_data.json', data)
+        name = hotel.name if previous_name is None else previous_name
+        Journal(journal_filename(name)).clear()
+        self.journal_entries.pop(name, None)
+
+    def _customer_record(self, customer, name):
+        """
+        Returns the registry record of a customer, by its ID or else by name.
+        """
+        if customer.id is not None:
+            return self.customers.get(customer.id)
+        return self.customers.find(name)
+
+    def load_customer(self, customer):
+        """
+        Loads the customer information from the customer registry.
+        """
+        record = self._customer_record(customer, customer.name)
+        if record is not None:
+            customer.id = record['id']
+            customer.name = record['name']
+            customer.address = record['address']
+
+    def save_customer(self, customer, previous_name=None):
+        """
+        Saves the customer information to the customer registry, removing the
+        customer if its name was reset.
+        """
+        record = self._customer_record(customer, customer.name if previous_name is None else previous_name)
+        if customer.name is None:
+            if record is not None:
+                self.customers.remove(record['id'])
+            customer.id = None
+        elif record is None:
+            customer.id = self.customers.add(customer.name, customer.address)['id']
+        else:
+            customer.id = record['id']
+            self.customers.update(record['id'], customer.name, customer.address)
+
+
+def month_of(ordinal):
+    """
+    Returns the month of a date ordinal, as a 'YYYY-MM' string.
+    """
+    return date.fromordinal(ordinal).isoformat()[:7]
+
+
+def segment_filename(hotel_name, month):
+    """
+    Returns the name of the file with the reservations of a hotel starting in a month.
+    """
+    return f'hotel_{hotel_name}_{month}.json'
+
+
+class PartitionedJsonStorage(JsonStorage):
+    """
+    Stores every hotel as a JSON header file plus one JSON segment file per
+    month of reservations, and loads the reservations of a hotel lazily.
+
+    The header holds the name, address, rooms and ID counter of the hotel and
+    an index of its segments: for every month, the segment file with the
+    reservations starting in it, their number, their latest end date and
+    their lowest and highest IDs. Loading a hotel reads only the header and
+    the journal. A segment is paged in the first time a date range or a
+    reservation ID needs it, so a query for the next 30 days reads one or two
+    segments however long the history of the hotel is, and the reservations
+    of a hotel are those paged in so far.
+
+    Attributes:
+        partitions (dict): For every loaded hotel, by name, its segment index
+            ('segments'), the months paged in ('loaded') and the IDs cancelled
+            in its journal whose segments are not paged in yet ('cancelled').
+    """
+
+    def __init__(self, customers_filename='customers.json'):
+        super().__init__(customers_filename)
+        self.partitions = {}
+
+    def load(self, hotel):
+        """
+        Loads the header of a hotel and replays its journal, without reading any segment.
+        """
+        self.partitions[hotel.name] = {'segments': {}, 'loaded': set(), 'cancelled': set()}
+        return super().load(hotel)
+
+    def _load_data(self, hotel, data):
+        """
+        Updates a hotel with its header. Files saved by JsonStorage keep every
+        reservation in the header, and those are loaded at once.
+        """
+        super()._load_data(hotel, data)
+        self.partitions[hotel.name]['segments'] = data.get('segments', {})
+
+    def _replay(self, hotel, event):
+        """
+        Applies an event of the journal of a hotel, remembering the cancelled
+        reservations that are not paged in yet.
+        """
+        if event['event'] == 'cancel' and hotel.reservations.get(event['id']) is None:
+            self.partitions[hotel.name]['cancelled'].add(event['id'])
+        super()._replay(hotel, event)
+
+    def _saved_reservations(self, data):
+        """
+        Returns every reservation dictionary of a header and of its segments.
+        """
+        reservations = list(data.get('reservations', []))
+        for entry in data.get('segments', {}).values():
+            reservations.extend(read_json(entry['file']) or [])
+        return reservations
+
+    def _page_in(self, hotel, partition, month):
+        """
+        Adds the reservations of a segment to a hotel and to its availability index.
+        """
+        partition['loaded'].add(month)
+        for data in read_json(partition['segments'][month]['file']) or []:
+            if data['id'] in partition['cancelled']:
+                partition['cancelled'].discard(data['id'])
+                continue
+            if hotel.reservations.get(data['id']) is not None:
+                continue
+            reservation = Reservation.from_dict(data)
+            hotel.reservations.append(reservation)
+            if hotel.availability_index is not None:
+                hotel.availability_index.add(reservation)
+
+    def load_range(self, hotel, start_date, end_date):
+        """
+        Pages in the segments of a hotel with reservations that may overlap a date range.
+
+        Args:
+            hotel (Hotel): The hotel, loaded from this storage.
+            start_date (str or date): The start date of the date range.
+            end_date (str or date): The end date of the date range.
+        """
+        partition = self.partitions.get(hotel.name)
+        if partition is None:
+            return
+        start, end = to_ordinal(start_date), to_ordinal(end_date)
+        for month, entry in partition['segments'].items():
+            if (month not in partition['loaded'] and to_ordinal(f'{month}-01') < end
+                    and to_ordinal(entry['end_date']) > start):
+                self._page_in(hotel, partition, month)
+
+    def load_reservation(self, hotel, reservation_id):
+        """
+        Pages in the segments of a hotel whose ID range holds a reservation ID,
+        until the reservation is found.
+        """
+        partition = self.partitions.get(hotel.name)
+        if partition is None:
+            return
+        for month, entry in partition['segments'].items():
+            if hotel.reservations.get(reservation_id) is not None:
+                return
+            low, high = entry['ids']
+            if month not in partition['loaded'] and low <= reservation_id <= high:
+                self._page_in(hotel, partition, month)
+
+    def count_reservations(self, hotel):
+        """
+        Returns the number of reservations of a hotel, counting the segments
+        that are not paged in from the counts in the header.
+        """
+        partition = self.partitions.get(hotel.name)
+        if partition is None:
+            return len(hotel.reservations)
+        stored = sum(entry['count'] for month, entry in partition['segments'].items()
+                     if month not in partition['loaded'])
+        return len(hotel.reservations) + stored - len(partition['cancelled'])
+
+    def is_available(self, hotel, room_number, start_date, end_date):
+        """
+        Checks the availability of a room, paging in the segments of the date range first.
+        """
+        self.load_range(hotel, start_date, end_date)
+        return super().is_available(hotel, room_number, start_date, end_date)
+
+    def save(self, hotel, previous_name=None):
+        """
+        Saves the header of a hotel and the segments of the months it changed,
+        and clears its journal.
+
+        The segments that were not paged in are kept as they are, except that
+        a renamed hotel moves all of them to files with its new name. A hotel
+        that was not loaded from this storage is saved as it is in memory,
+        like JsonStorage does.
+
+        Args:
+            hotel (Hotel): The hotel to save.
+            previous_name (str, optional): The name the hotel was saved under, if it changed.
+        """
+        name = hotel.name if previous_name is None else previous_name
+        partition = self.partitions.pop(name, None)
+        if partition is None:
+            segments = (read_json(f'hotel_{name}_data.json') or {}).get('segments', {})
+            partition = {'segments': segments, 'loaded': set(segments), 'cancelled': set()}
+        segments = partition['segments']
+        if hotel.name is None:
+            partition['loaded'] = set(segments)
+        months = {month_of(reservation.start) for reservation in hotel.reservations}
+        for month, entry in segments.items():
+            low, high = entry['ids']
+            if month not in partition['loaded'] and (
+                    month in months or hotel.name != name
+                    or any(low <= reservation_id <= high for reservation_id in partition['cancelled'])):
+                self._page_in(hotel, partition, month)
+        if hotel.name not in (None, name):
+            rename_reservations(hotel)
+        by_month = {}
+        for reservation in hotel.reservations:
+            by_month.setdefault(month_of(reservation.start), []).append(reservation)
+        saved = {month: entry for month, entry in segments.items() if month not in partition['loaded']}
+        for month, reservations in by_month.items():
+            ids = [reservation.id for reservation in reservations]
+            saved[month] = {
+                'file': segment_filename(hotel.name, month),
+                'count': len(reservations),
+                'end_date': max(reservation.end_date for reservation in reservations),
+                'ids': [min(ids), max(ids)]
+            }
+            write_json(saved[month]['file'], [reservation.to_dict() for reservation in reservations])
+        data = {
+            'name': hotel.name,
+            'address': hotel.address,
+            'rooms': hotel.rooms.numbers(),
+            'out_of_service': hotel.rooms.out_of_service(),
+            'segments': dict(sorted(saved.items())),
+            'next_id': hotel.next_id if hotel.next_id is not None else hotel.reservations.next_id()
+        }
+        write_json(f'hotel_{hotel.name}_data.json', data)
+        files = {entry['file'] for entry in saved.values()}
+        for entry in segments.values():
+            if entry['file'] not in files:
+                try:
+                    os.remove(entry['file'])
+                except FileNotFoundError:
+                    pass
+        Journal(journal_filename(name)).clear()
+        self.journal_entries.pop(name, None)
+        if hotel.name is not None:
+            self.partitions[hotel.name] = {'segments': data['segments'], 'cancelled': set(),
+                                           'loaded': partition['loaded'] | set(by_month)}
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    address TEXT,
+    next_id INTEGER NOT NULL DEFAULT 1,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    hotel_id INTEGER NOT NULL REFERENCES hotels (id),
+    room_number INTEGER NOT NULL,
+    in_service INTEGER NOT NULL DEFAULT 1,
+    UNIQUE (hotel_id, room_number)
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    hotel_id INTEGER NOT NULL REFERENCES hotels (id),
+    id INTEGER NOT NULL,
+    customer TEXT,
+    room_number INTEGER NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    PRIMARY KEY (hotel_id, id)
+);
+CREATE INDEX IF NOT EXISTS reservations_by_room
+    ON reservations (hotel_id, room_number, start_date, end_date);
+CREATE TABLE IF NOT EXISTS customers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    address TEXT
+);
+"""
+
+
+class SqliteStorage:
+    """
+    Stores hotels, rooms, reservations and customers in indexed SQLite tables.
+
+    Availability is an indexed range query on the reservations of a room, and
+    every booking runs in a transaction, so concurrent processes sharing the
+    database cannot double-book a room.
+
+    Attributes:
+        connection (sqlite3.Connection): The connection to the database.
+    """
+
+    def __init__(self, path='hotels.db'):
+        """
+        Opens the database at the given path, creating the tables if needed.
+
+        Args:
+            path (str): The path of the database file, or ':memory:'.
+        """
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """
+        Gives back the rooms of their reservations to the hotels of a database
+        written before reservations stopped removing rooms, once.
+        """
+        with self.transaction():
+            if self.connection.execute('PRAGMA user_version').fetchone()[0] < 1:
+                self.connection.execute(
+                    'INSERT OR IGNORE INTO rooms (hotel_id, room_number) '
+                    'SELECT DISTINCT hotel_id, room_number FROM reservations')
+                self.connection.execute('PRAGMA user_version = 1')
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+        self.connection.close()
+
+    @contextmanager
+    def transaction(self, hotel_name=None):
+        """
+        Runs the changes made in the block in one transaction.
+
+        The transaction takes the write lock of the database when it starts, so
+        the changes of a booking are checked and applied without other writers
+        in between. Nested blocks join the outer transaction.
+
+        Args:
+            hotel_name (str, optional): Unused; the whole database is locked.
+        """
+        if self.connection.in_transaction:
+            yield
+            return
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.connection.rollback()
+            raise
+        self.connection.commit()
+
+    def version(self, hotel_name):
+        """
+        Returns the version of a stored hotel, increased by every change, or None.
+        """
+        row = self.connection.execute(
+            'SELECT version FROM hotels WHERE name = ?', (hotel_name,)).fetchone()
+        return row[0] if row else None
+
+    def _bump_version(self, hotel_id):
+        """
+        Increases the version of a stored hotel.
+        """
+        self.connection.execute('UPDATE hotels SET version = version + 1 WHERE id = ?', (hotel_id,))
+
+    def _hotel_id(self, name):
+        """
+        Returns the ID of a hotel, or None if it is not stored.
+        """
+        row = self.connection.execute('SELECT id FROM hotels WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def _ensure_hotel(self, hotel):
+        """
+        Returns the ID of a hotel, storing the hotel and its rooms first if needed.
+        """
+        hotel_id = self._hotel_id(hotel.name)
+        if hotel_id is None:
+            hotel_id = self.connection.execute(
+                'INSERT INTO hotels (name, address, next_id) VALUES (?, ?, ?)',
+                (hotel.name, hotel.address, hotel.next_id or 1)).lastrowid
+            self._insert_rooms(hotel_id, hotel.rooms)
+        return hotel_id
+
+    def _insert_rooms(self, hotel_id, rooms):
+        """
+        Stores the rooms of a hotel.
+        """
+        out_of_service = set(rooms.out_of_service())
+        self.connection.executemany(
+            'INSERT INTO rooms (hotel_id, room_number, in_service) VALUES (?, ?, ?)',
+            ((hotel_id, room, room not in out_of_service) for room in rooms.numbers()))
+
+    def _reservations(self, hotel_id, hotel_name):
+        """
+        Returns the reservations of a hotel as dictionaries, in ID order.
+        """
+        rows = self.connection.execute(
+            'SELECT id, customer, room_number, start_date, end_date FROM reservations '
+            'WHERE hotel_id = ? ORDER BY id', (hotel_id,))
+        return ReservationBook(
+            Reservation(customer, hotel_name, room_number, start_date, end_date, reservation_id)
+            for reservation_id, customer, room_number, start_date, end_date in rows)
+
+    def load(self, hotel):
+        """
+        Loads a hotel from the database.
+
+        Args:
+            hotel (Hotel): The hotel to load, updated in place.
+
+        Returns:
+            bool: True if the hotel was found, False otherwise.
+        """
+        row = self.connection.execute(
+            'SELECT id, address, next_id FROM hotels WHERE name = ?', (hotel.name,)).fetchone()
+        if row is None:
+            return False
+        hotel_id, hotel.address, hotel.next_id = row
+        rows = self.connection.execute(
+            'SELECT room_number, in_service FROM rooms WHERE hotel_id = ? ORDER BY rowid',
+            (hotel_id,)).fetchall()
+        hotel.rooms = RoomSet((room for room, _ in rows),
+                              (room for room, in_service in rows if not in_service))
+        hotel.reservations = self._reservations(hotel_id, hotel.name)
+        return True
+
+    def stored_reservations(self, hotel):
+        """
+        Returns the reservations stored for a hotel, or the reservations in
+        memory if the hotel is not stored yet.
+        """
+        hotel_id = self._hotel_id(hotel.name)
+        if hotel_id is None:
+            return ReservationBook(hotel.reservations)
+        return self._reservations(hotel_id, hotel.name)
+
+    def is_available(self, hotel, room_number, start_date, end_date):
+        """
+        Checks the availability of a room with a range query on the reservation index.
+        """
+        row = self.connection.execute(
+            'SELECT 1 FROM reservations JOIN hotels ON hotels.id = reservations.hotel_id '
+            'WHERE hotels.name = ? AND room_number = ? AND start_date < ? AND end_date > ? '
+            'LIMIT 1', (hotel.name, room_number, end_date, start_date)).fetchone()
+        return row is None
+
+    def load_range(self, hotel, start_date, end_date):  # pylint: disable=unused-argument
+        """
+        Loads the reservations of a hotel that overlap a date range. A loaded
+        hotel already holds all of them.
+        """
+
+    def load_reservation(self, hotel, reservation_id):  # pylint: disable=unused-argument
+        """
+        Loads the reservation of a hotel with the given ID. A loaded hotel
+        already holds all of them.
+        """
+
+    def count_reservations(self, hotel):
+        """
+        Returns the number of reservations of a hotel.
+        """
+        return len(hotel.reservations)
+
+    def next_reservation_id(self, hotel_name):
+        """
+        Gets the next available ID for a reservation of a hotel from its ID counter.
+        """
+        row = self.connection.execute(
+            'SELECT next_id FROM hotels WHERE name = ?', (hotel_name,)).fetchone()
+        return row[0] if row else 1
+
+    def add_reservation(self, hotel, reservation):
+        """
+        Stores a new reservation of a hotel and takes its room.
+        """
+        self.add_reservations(hotel, [reservation])
+
+    def add_reservations(self, hotel, reservations):
+        """
+        Stores several new reservations of a hotel in one transaction.
+        """
+        with self.transaction():
+            hotel_id = self._ensure_hotel(hotel)
+            self.connection.executemany(
+                'INSERT INTO reservations (hotel_id, id, customer, room_number, start_date, end_date) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ((hotel_id, r['id'], r['customer'], r['room_number'], r['start_date'], r['end_date'])
+                 for r in reservations))
+            self.connection.execute('UPDATE hotels SET next_id = MAX(next_id, ?) WHERE id = ?',
+                                    (max(r['id'] for r in reservations) + 1, hotel_id))
+            self._bump_version(hotel_id)
+
+    def remove_reservation(self, hotel, reservation):
+        """
+        Deletes a reservation of a hotel.
+        """
+        with self.transaction():
+            hotel_id = self._ensure_hotel(hotel)
+            self.connection.execute('DELETE FROM reservations WHERE hotel_id = ? AND id = ?',
+                                    (hotel_id, reservation['id']))
+            self._bump_version(hotel_id)
+
+    def save(self, hotel, previous_name=None):
+        """
+        Replaces the stored hotel, rooms and reservations with the ones in memory.
+
+        A hotel whose name was reset by Hotel.delete_hotel is deleted.
+
+        Args:
+            hotel (Hotel): The hotel to save.
+            previous_name (str, optional): The name the hotel was saved under, if it changed.
+        """
+        with self.transaction():
+            hotel_id = self._hotel_id(hotel.name if previous_name is None else previous_name)
+            if hotel_id is not None:
+                self.connection.execute('DELETE FROM reservations WHERE hotel_id = ?', (hotel_id,))
+                self.connection.execute('DELETE FROM rooms WHERE hotel_id = ?', (hotel_id,))
+                if hotel.name is None:
+                    self.connection.execute('DELETE FROM hotels WHERE id = ?', (hotel_id,))
+                    return
+                self.connection.execute('UPDATE hotels SET name = ?, address = ? WHERE id = ?',
+                                        (hotel.name, hotel.address, hotel_id))
+                if hotel.next_id is not None:
+                    self.connection.execute(
+                        'UPDATE hotels SET next_id = MAX(next_id, ?) WHERE id = ?',
+                        (hotel.next_id, hotel_id))
+                self._insert_rooms(hotel_id, hotel.rooms)
+            elif hotel.name is None:
+                return
+            hotel_id = self._ensure_hotel(hotel)
+            self.connection.executemany(
+                'INSERT INTO reservations (hotel_id, id, customer, room_number, start_date, end_date) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ((hotel_id, r['id'], r['customer'], r['room_number'], r['start_date'], r['end_date'])
+                 for r in hotel.reservations))
+            self._bump_version(hotel_id)
+
+    def load_customer(self, customer):
+        """
+        Loads the address of a customer from the database.
+        """
+        row = self.connection.execute(
+            'SELECT id, address FROM customers WHERE name = ?', (customer.name,)).fetchone()
+        if row is not None:
+            customer.id, customer.address = row
+
+    def save_customer(self, customer, previous_name=None):
+        """
+        Saves a customer to the database, deleting it if its name was reset.
+        """
+        name = customer.name if previous_name is None else previous_name
+        with self.transaction():
+            if customer.name is None:
+                self.connection.execute('DELETE FROM customers WHERE name = ?', (name,))
+                customer.id = None
+            elif self.connection.execute('UPDATE customers SET name = ?, address = ? WHERE name = ?',
+                                         (customer.name, customer.address, name)).rowcount == 0:
+                customer.id = self.connection.execute(
+                    'INSERT INTO customers (name, address) VALUES (?, ?)',
+                    (customer.name, customer.address)).lastrowid
@@ -1,6 +1,9 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import call, mock_open, patch
 from customer import Customer
+from storage import SqliteStorage
 
 class CustomerTestCase(unittest.TestCase):
     """
@@ -11,8 +14,18 @@ class CustomerTestCase(unittest.TestCase):
         """
         Set up the test case by creating a Customer instance.
         """
+        # Lock files are real files, and customer registries are shared by
+        # file path, so every test runs in its own temporary directory.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory.name)
         self.customer = Customer("John Doe", "123 Main St")
         self.customer_information = """ {"name": "John Doe", "address": "123 Main St"} """
+        # The mocked journal file has no real file descriptor to fsync.
+        patcher = patch('journal.os.fsync')
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_display_information(self):
         """ Test case 1: Display customer information."""
@@ -28,9 +41,11 @@ class CustomerTestCase(unittest.TestCase):
 
     def test_save_information(self):
         """ Test case 1: Save customer information to a JSON file."""
-        with patch('builtins.open', create=False) as mock_json_file:
+        with patch('builtins.open', mock_open(read_data=self.customer_information), create=False) as mock_json_file:
             self.customer.save_information()
-            mock_json_file.assert_called_once_with('customers.json', 'w', encoding='utf-8')
+            mock_json_file.assert_any_call('customers_journal.jsonl', 'a', encoding='utf-8')
+            self.assertNotIn(call('customers.json', 'w', encoding='utf-8'), mock_json_file.call_args_list)
+            self.assertEqual(self.customer.id, 1)
 
     def test_modify_information(self):
         """ Test case 1: Modify customer information."""
@@ -46,5 +61,20 @@ class CustomerTestCase(unittest.TestCase):
             self.assertEqual(self.customer.name, None)
             self.assertEqual(self.customer.address, None)
 
+    def test_sqlite_storage(self):
+        """ Test case 1: Save, rename and delete a customer in the SQLite storage."""
+        storage = SqliteStorage(':memory:')
+        self.addCleanup(storage.close)
+        Customer("John Doe", "123 Main St", storage=storage).save_information()
+        customer = Customer("John Doe", None, storage=storage)
+        customer.load_information()
+        self.assertEqual(customer.address, "123 Main St")
+        customer.modify_information(name="Jane Smith", address="456 Elm St")
+        renamed = Customer("Jane Smith", None, storage=storage)
+        renamed.load_information()
+        self.assertEqual(renamed.address, "456 Elm St")
+        renamed.delete_customer()
+        self.assertEqual(storage.connection.execute('SELECT COUNT(*) FROM customers').fetchone(), (0,))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,6 @@
 """ Test cases for the Reservation class. """
 import unittest
+from datetime import date
 from reservation import Reservation
 
 class ReservationTestCase(unittest.TestCase):
@@ -39,5 +40,23 @@ class ReservationTestCase(unittest.TestCase):
         expected_details += "End Date: 2022-02-15\n"
         self.assertEqual(self.reservation.print_reservation_details(), expected_details)
 
+    def test_compact_representation(self):
+        """ Test case 4: Reservations use slots and keep their dates as ordinals."""
+        self.assertFalse(hasattr(self.reservation, '__dict__'))
+        self.assertEqual(self.reservation.start, date(2022, 1, 1).toordinal())
+        self.assertEqual(self.reservation.end_date, "2022-02-15")
+        other = Reservation("".join(["John ", "Doe"]), "Fiesta", 102, date(2022, 1, 1), "2022-01-02", 2)
+        self.assertIs(other.customer, self.reservation.customer)
+
+    def test_reads_like_a_dictionary(self):
+        """ Test case 5: A reservation compares and converts like its dictionary."""
+        data = self.reservation.to_dict()
+        self.assertEqual(self.reservation, data)
+        self.assertEqual(dict(self.reservation), data)
+        self.assertEqual(self.reservation['start_date'], "2022-01-01")
+        self.assertEqual(Reservation.from_dict(data), self.reservation)
+        with self.assertRaises(KeyError):
+            self.reservation['start']  # pylint: disable=pointless-statement
+
 if __name__ == '__main__':
     unittest.main()
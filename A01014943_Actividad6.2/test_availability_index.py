@@ -0,0 +1,54 @@
+""" Test cases for the AvailabilityIndex class. """
+import unittest
+from availability_index import AvailabilityIndex
+
+class AvailabilityIndexTestCase(unittest.TestCase):
+    """
+    Test case for the AvailabilityIndex class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case by creating an index with two reservations of room 101.
+        """
+        self.reservations = [
+            {"id": 1, "customer": "John Doe", "hotel": "Fiesta", "room_number": 101,
+             "start_date": "2022-01-01", "end_date": "2022-02-15"},
+            {"id": 2, "customer": "Jane Smith", "hotel": "Fiesta", "room_number": 101,
+             "start_date": "2022-03-01", "end_date": "2022-03-05"},
+        ]
+        self.index = AvailabilityIndex(self.reservations)
+
+    def test_is_available(self):
+        """ Test case 1: Check free and overlapping date ranges."""
+        self.assertTrue(self.index.is_available(101, "2021-10-01", "2021-10-15"))
+        self.assertTrue(self.index.is_available(101, "2022-02-15", "2022-03-01"))
+        self.assertFalse(self.index.is_available(101, "2022-01-10", "2022-01-12"))
+        self.assertFalse(self.index.is_available(101, "2022-02-01", "2022-03-02"))
+        self.assertTrue(self.index.is_available(102, "2022-01-01", "2022-02-15"))
+
+    def test_overlapping_reservations(self):
+        """ Test case 2: A long reservation is found behind a later, shorter one."""
+        self.index.add({"id": 3, "room_number": 102, "start_date": "2022-01-01", "end_date": "2022-12-31"})
+        self.index.add({"id": 4, "room_number": 102, "start_date": "2022-02-01", "end_date": "2022-02-02"})
+        self.assertFalse(self.index.is_available(102, "2022-06-01", "2022-06-02"))
+
+    def test_remove(self):
+        """ Test case 3: Remove a reservation and free its date range."""
+        self.assertTrue(self.index.remove(self.reservations[0]))
+        self.assertTrue(self.index.is_available(101, "2022-01-10", "2022-01-12"))
+        self.assertFalse(self.index.is_available(101, "2022-03-02", "2022-03-03"))
+        self.assertFalse(self.index.remove(self.reservations[0]))
+
+    def test_free_rooms_and_occupancy(self):
+        """ Test case 4: List the free rooms and count the reserved rooms per night."""
+        self.index.add({"id": 3, "room_number": 102, "start_date": "2022-02-14", "end_date": "2022-02-16"})
+        self.assertEqual(self.index.free_rooms([101, 102, 103], "2022-02-14", "2022-02-15"), [103])
+        self.assertEqual(self.index.free_rooms([101, 102, 103], "2022-02-15", "2022-02-16"), [101, 103])
+        self.assertEqual(self.index.occupancy("2022-02-13", "2022-02-17"),
+                         [("2022-02-13", 1), ("2022-02-14", 2), ("2022-02-15", 1), ("2022-02-16", 0)])
+        self.index.remove(self.reservations[0])
+        self.assertEqual(self.index.occupancy("2022-02-14", "2022-02-15"), [("2022-02-14", 1)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+""" Test cases for the CustomerRegistry class. """
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+from customer import Customer
+from customer_registry import CustomerRegistry
+from storage import JsonStorage
+
+
+def add_customer(filename, name):
+    """ Adds a customer to a customer file from another process."""
+    return CustomerRegistry(filename).add(name, "123 Main St")['id']
+
+class CustomerRegistryTestCase(unittest.TestCase):
+    """
+    Test case for the CustomerRegistry class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a registry in a temporary directory.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'customers.json')
+        self.registry = CustomerRegistry(self.filename)
+
+    def test_many_customers(self):
+        """ Test case 1: Customers are kept side by side and found by ID and by name."""
+        john = self.registry.add("John Doe", "123 Main St")
+        jane = self.registry.add("Jane Smith", "456 Elm St")
+        self.assertEqual((john['id'], jane['id']), (1, 2))
+        self.assertEqual(self.registry.get(2), jane)
+        self.assertEqual(self.registry.find("John Doe"), john)
+        self.assertIsNone(self.registry.find("Nobody"))
+        self.assertEqual(self.registry.customer_of({"id": 1, "customer": "Jane Smith"}), jane)
+
+    def test_persistence(self):
+        """ Test case 2: Changes are journaled, replayed, and compacted into the file."""
+        self.registry.add("John Doe", "123 Main St")
+        self.registry.add("Jane Smith", "456 Elm St")
+        self.registry.update(1, "John Doe", "789 Oak St")
+        self.registry.remove(2)
+        self.assertFalse(os.path.exists(self.filename))
+        reloaded = CustomerRegistry(self.filename)
+        self.assertEqual(list(reloaded), [{"id": 1, "name": "John Doe", "address": "789 Oak St"}])
+        reloaded.save()
+        self.assertFalse(os.path.exists(reloaded.journal.filename))
+        reloaded = CustomerRegistry(self.filename)
+        self.assertEqual(reloaded.add("Jane Smith", "456 Elm St")['id'], 3)
+
+    def test_single_customer_file(self):
+        """ Test case 3: A customer file with a single customer is read as customer 1."""
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            json.dump({"name": "John Doe", "address": "123 Main St"}, file)
+        self.assertEqual(self.registry.get(1), {"id": 1, "name": "John Doe", "address": "123 Main St"})
+
+    def test_customers_do_not_overwrite_each_other(self):
+        """ Test case 4: Saving a customer keeps the other customers."""
+        storage = JsonStorage(self.filename)
+        Customer("John Doe", "123 Main St", storage=storage).save_information()
+        Customer("Jane Smith", "456 Elm St", storage=storage).save_information()
+        customer = Customer("John Doe", storage=JsonStorage(self.filename))
+        customer.load_information()
+        self.assertEqual((customer.id, customer.address), (1, "123 Main St"))
+        self.assertEqual(len(CustomerRegistry(self.filename)), 2)
+
+    def test_registry_is_shared(self):
+        """ Test case 5: Storages and customers share one registry per customer file."""
+        self.assertIs(JsonStorage(self.filename).customers, JsonStorage(self.filename).customers)
+        self.assertIs(CustomerRegistry.shared(self.filename), JsonStorage(self.filename).customers)
+
+    def test_registries_see_each_other(self):
+        """ Test case 6: Registries of one file read only the new changes of the others."""
+        other = CustomerRegistry(self.filename)
+        self.registry.add("John Doe", "123 Main St")
+        self.assertEqual(other.add("Jane Smith", "456 Elm St")['id'], 2)
+        with patch.object(self.registry, '_read') as read:
+            self.assertEqual(self.registry.find("Jane Smith")['id'], 2)
+            read.assert_not_called()
+        other.save()
+        self.registry.remove(1)
+        self.assertEqual(list(other), [{"id": 2, "name": "Jane Smith", "address": "456 Elm St"}])
+
+    def test_concurrent_customers(self):
+        """ Test case 7: Processes adding customers at once get different IDs."""
+        with ProcessPoolExecutor(4) as executor:
+            ids = list(executor.map(add_customer, [self.filename] * 4, ["A", "B", "C", "D"]))
+        self.assertEqual(sorted(ids), [1, 2, 3, 4])
+        self.assertEqual(len(CustomerRegistry(self.filename)), 4)
+
+if __name__ == '__main__':
+    unittest.main()
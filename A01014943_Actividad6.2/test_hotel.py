@@ -1,7 +1,11 @@
 """ Test cases for the Hotel class. """
+import os
+import tempfile
 import unittest
-from unittest.mock import mock_open,patch
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import call,mock_open,patch
 from hotel import Hotel
+from storage import PartitionedJsonStorage, SqliteStorage
 
 class HotelTestCase(unittest.TestCase):
     """
@@ -13,6 +17,16 @@ class HotelTestCase(unittest.TestCase):
         Set up the test case by creating a Hotel instance and a mocked reservation.
         """
         self.hotel = Hotel("Fiesta", "123 Main St", list(range(101, 111)))
+        # Lock files are real files, so they are created in a temporary directory.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory.name)
+        # The mocked files have no real file descriptor to fsync and are never created.
+        for target in ('journal.os.fsync', 'storage.os.fsync', 'storage.os.replace'):
+            patcher = patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
         # Mocked JSON file with hotel information to avoid reading from a file.
         self.hotel_information = """
                {
@@ -41,7 +55,8 @@ class HotelTestCase(unittest.TestCase):
         """ Test case 1: Save hotel data to a JSON file."""
         with patch('builtins.open', create=False) as mock_json_file:
             self.hotel.save_data()
-            mock_json_file.assert_called_once_with('hotel_Fiesta_data.json', 'w', encoding='utf-8')
+            mock_json_file.assert_called_once_with('hotel_Fiesta_data.json.tmp', 'w', encoding='utf-8')
+            os.replace.assert_called_once_with('hotel_Fiesta_data.json.tmp', 'hotel_Fiesta_data.json')
 
     def test_load_data(self):
         """ Test case 1: Load hotel data from a JSON file."""
@@ -51,7 +66,8 @@ class HotelTestCase(unittest.TestCase):
             loaded_hotel = hotel.load_data()
             self.assertEqual(loaded_hotel.name, "Fiesta")
             self.assertEqual(loaded_hotel.address, "123 Main St.")
-            self.assertEqual(loaded_hotel.rooms, [103, 104, 105, 106, 107, 108, 109, 110])
+            # The file predates the room set, so the room of the reservation is given back.
+            self.assertEqual(loaded_hotel.rooms, [101, 103, 104, 105, 106, 107, 108, 109, 110])
             self.assertEqual(loaded_hotel.reservations, [{"id": 1, "customer": "John Doe", "hotel": "Fiesta", "room_number": 101, "start_date": "2022-01-01", "end_date": "2022-02-15"}])
 
     def test_display_information(self):
@@ -78,6 +94,14 @@ class HotelTestCase(unittest.TestCase):
         with patch('builtins.open', side_effect=FileNotFoundError):
             self.assertTrue(self.hotel.verify_room_availability(101, '2021-10-01', '2021-10-15'))
 
+    def test_verify_room_availability_in_memory(self):
+        """ Verify room availability without reading the file after the first check."""
+        with patch('builtins.open', mock_open(read_data=self.hotel_information), create=True):
+            self.assertTrue(self.hotel.verify_room_availability(102, '2021-10-01', '2021-10-15'))
+        with patch('builtins.open', side_effect=AssertionError("file read")):
+            self.assertFalse(self.hotel.verify_room_availability(101, '2022-02-01', '2022-02-03'))
+            self.assertTrue(self.hotel.verify_room_availability(101, '2022-02-15', '2022-02-20'))
+
     def test_reserve_room(self):
         """ Test reserving a room."""
         # Test case 1: Reserve a room.
@@ -92,6 +116,112 @@ class HotelTestCase(unittest.TestCase):
 
             self.assertEqual(self.hotel.reservations, [{"id": 2, "customer": "John Doe", "hotel": "Fiesta", "room_number": 102, "start_date": "2021-10-01", "end_date": "2021-10-15"}])
 
+    def test_reserve_room_appends_to_journal(self):
+        """ Reserving a room appends one event to the journal instead of rewriting the data file."""
+        with patch('builtins.open', mock_open(read_data=self.hotel_information), create=True) as mock_file:
+            self.hotel.reserve_room(102, "John Doe", "2021-10-01", "2021-10-15")
+            mock_file.assert_any_call('hotel_Fiesta_journal.jsonl', 'a', encoding='utf-8')
+            self.assertNotIn(call('hotel_Fiesta_data.json', 'w', encoding='utf-8'),
+                             mock_file.call_args_list)
+            self.assertEqual(self.hotel.storage.journal_entries['Fiesta'], 1)
+
+    def test_load_data_replays_journal(self):
+        """ Loading the hotel data applies the journal events saved after the data file."""
+        journal_lines = (
+            '{"event": "reserve", "reservation": {"id": 2, "customer": "Jane Smith", '
+            '"hotel": "Fiesta", "room_number": 103, "start_date": "2022-03-01", '
+            '"end_date": "2022-03-05"}}\n'
+            '{"event": "cancel", "id": 1, "room_number": 101}\n'
+            '{"event": "reserve", "reserv'
+        )
+        def open_file(filename, *args, **kwargs):
+            data = journal_lines if filename.endswith('.jsonl') else self.hotel_information
+            return mock_open(read_data=data)()
+        with patch('builtins.open', side_effect=open_file):
+            hotel = Hotel("Fiesta", "123 Main St.").load_data()
+        self.assertEqual([r['id'] for r in hotel.reservations], [2])
+        self.assertEqual(hotel.rooms, [101, 103, 104, 105, 106, 107, 108, 109, 110])
+        self.assertEqual(hotel.storage.journal_entries['Fiesta'], 2)
+        self.assertFalse(hotel.verify_room_availability(103, '2022-03-02', '2022-03-03'))
+        self.assertTrue(hotel.verify_room_availability(101, '2022-01-01', '2022-02-15'))
+
+    def test_reserve_rooms(self):
+        """ Test reserving several rooms with one journal write."""
+        bookings = [(102, "Tour Group", "2021-10-01", "2021-10-15"),
+                    (103, "Tour Group", "2021-10-01", "2021-10-15")]
+        with patch('builtins.open', mock_open(read_data=self.hotel_information), create=True) as mock_file:
+            results = self.hotel.reserve_rooms(bookings)
+            journal_writes = [c for c in mock_file.call_args_list if c.args[1:] == ('a',)]
+        self.assertEqual([r['status'] for r in results], ['reserved', 'reserved'])
+        self.assertEqual([r['reservation']['id'] for r in results], [2, 3])
+        self.assertEqual(list(self.hotel.reservations), [r['reservation'] for r in results])
+        self.assertEqual(len(journal_writes), 1)
+        self.assertIn(102, self.hotel.rooms)
+        self.assertFalse(self.hotel.verify_room_availability(102, '2021-10-14', '2021-10-20'))
+
+    def test_reserve_rooms_all_or_nothing(self):
+        """ Test that no room is reserved when one booking of the batch is unavailable."""
+        bookings = [(102, "Tour Group", "2022-01-10", "2022-01-12"),
+                    (101, "Tour Group", "2022-01-10", "2022-01-12"),
+                    (102, "Tour Group", "2022-01-11", "2022-01-13"),
+                    (102, "Tour Group", "2022-03-01", "2022-03-05")]
+        with patch('builtins.open', mock_open(read_data=self.hotel_information), create=True):
+            results = self.hotel.reserve_rooms(bookings)
+        self.assertEqual([r['status'] for r in results],
+                         ['not reserved', 'unavailable', 'unavailable', 'not reserved'])
+        self.assertEqual(self.hotel.reservations, [])
+        self.assertEqual(self.hotel.rooms, list(range(101, 111)))
+        self.assertIsNone(self.hotel.next_id)
+
+    def test_reserve_rooms_ignores_rejected_bookings(self):
+        """ Test that a booking only overlapping a rejected booking of the batch is available."""
+        bookings = [(101, "Tour Group", "2022-01-10", "2022-01-12"),
+                    (101, "Tour Group", "2022-02-14", "2022-02-20"),
+                    (101, "Tour Group", "2022-02-16", "2022-02-18")]
+        with patch('builtins.open', mock_open(read_data=self.hotel_information), create=True):
+            results = self.hotel.reserve_rooms(bookings)
+        self.assertEqual([r['status'] for r in results], ['unavailable', 'unavailable', 'not reserved'])
+
+    def test_rooms_are_kept_on_reservation(self):
+        """ A reserved room stays a room of the hotel and can be booked on other dates."""
+        with patch('builtins.open', mock_open(read_data=self.hotel_information), create=True):
+            self.hotel.reserve_room(102, "John Doe", "2021-10-01", "2021-10-15")
+            self.hotel.reserve_room(102, "Jane Smith", "2021-10-15", "2021-10-20")
+            self.hotel.rooms.set_in_service(103, False)
+            self.hotel.reserve_room(103, "Jane Smith", "2021-10-15", "2021-10-20")
+        self.assertEqual([r['customer'] for r in self.hotel.reservations], ["John Doe", "Jane Smith"])
+        self.assertIn("Number of Rooms: 10\n", self.hotel.display_information())
+        self.assertNotIn(103, self.hotel.rooms)
+        self.assertEqual(self.hotel.rooms.out_of_service(), [103])
+
+    def test_legacy_rooms_are_migrated(self):
+        """ Rooms dropped by reservations in a file saved before the room set can be booked."""
+        with open(os.path.join(os.path.dirname(__file__), 'hotel_Marriott_data.json'),
+                  encoding='utf-8') as file:
+            legacy = file.read()
+        with open('hotel_Marriott_data.json', 'w', encoding='utf-8') as file:
+            file.write(legacy)
+        os.replace.side_effect = os.rename
+        hotel = Hotel("Marriott", "123 Main St.").load_data()
+        self.assertEqual(hotel.rooms, [101, 102, 103, 104, 105, 106, 107, 108, 109, 110])
+        hotel.reserve_room(101, "Jane Smith", "2023-01-01", "2023-01-05")
+        self.assertEqual(len(hotel.reservations), 3)
+        hotel.rooms.remove(102)
+        hotel.save_data()
+        hotel.cancel_reservation(5)
+        self.assertNotIn(102, Hotel("Marriott", "123 Main St.").load_data().rooms)
+
+    def test_reservation_ids_are_not_reused(self):
+        """ The saved ID counter keeps IDs of cancelled reservations from being reused."""
+        information = self.hotel_information.replace('"reservations":', '"next_id": 5, "reservations":')
+        with patch('builtins.open', mock_open(read_data=information), create=True):
+            self.hotel.load_data()
+            self.hotel.cancel_reservation(1)
+            self.hotel.reserve_room(101, "Jane Smith", "2022-01-01", "2022-02-15")
+            self.hotel.reserve_room(103, "Jane Smith", "2022-01-01", "2022-02-15")
+        self.assertEqual([r['id'] for r in self.hotel.reservations], [5, 6])
+        self.assertEqual(self.hotel.next_id, 7)
+
     def test_cancel_reservation(self):
         """ Test canceling a reservation."""
         # Test case 1: Cancel a reservation.
@@ -115,5 +245,308 @@ class HotelTestCase(unittest.TestCase):
             self.assertEqual(self.hotel.rooms, [])
             self.assertEqual(self.hotel.reservations, [])
 
+def book_room(directory, guest_name):
+    """ Loads the Fiesta hotel in a directory and books room 105, in a separate process."""
+    os.chdir(directory)
+    hotel = Hotel("Fiesta", "123 Main St").load_data()
+    hotel.reserve_room(105, guest_name, "2022-05-01", "2022-05-03")
+
+
+class ConcurrentHotelTestCase(unittest.TestCase):
+    """
+    Test case for several Hotel instances sharing the same JSON files.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a saved hotel in a temporary directory.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory.name)
+        self.directory = directory.name
+        Hotel("Fiesta", "123 Main St").save_data()
+
+    def test_stale_hotel_is_reloaded(self):
+        """ A booking made from a stale copy of the hotel sees the other bookings first."""
+        first = Hotel("Fiesta", "123 Main St").load_data()
+        second = Hotel("Fiesta", "123 Main St").load_data()
+        first.reserve_room(102, "John Doe", "2022-01-01", "2022-01-05")
+        second.reserve_room(102, "Jane Smith", "2022-01-01", "2022-01-05")
+        second.reserve_room(103, "Jane Smith", "2022-01-01", "2022-01-05")
+        self.assertEqual([(r['id'], r['customer']) for r in second.reservations],
+                         [(1, "John Doe"), (2, "Jane Smith")])
+        self.assertEqual(len(Hotel("Fiesta", "123 Main St").load_data().reservations), 2)
+
+    def test_unloaded_hotels_are_refreshed(self):
+        """ Hotels that were not loaded read the bookings of the others before booking."""
+        first, second = Hotel("Fiesta", "123 Main St"), Hotel("Fiesta", "123 Main St")
+        self.assertTrue(first.verify_room_availability(103, "2022-01-01", "2022-01-05"))
+        self.assertTrue(second.verify_room_availability(103, "2022-01-01", "2022-01-05"))
+        first.reserve_room(102, "John Doe", "2022-01-01", "2022-01-05")
+        second.reserve_room(104, "Jane Smith", "2022-01-01", "2022-01-05")
+        first.reserve_room(103, "John Doe", "2022-01-01", "2022-01-05")
+        second.reserve_room(103, "Jane Smith", "2022-01-01", "2022-01-05")
+        reservations = Hotel("Fiesta", "123 Main St").load_data().reservations
+        self.assertEqual([(r['id'], r['room_number']) for r in reservations], [(1, 102), (2, 104), (3, 103)])
+
+    def test_compaction_keeps_stored_reservations(self):
+        """ Compacting the journal of a hotel that was not loaded keeps the stored reservations."""
+        hotel = Hotel("Fiesta", "123 Main St").load_data()
+        hotel.reserve_room(101, "John Doe", "2022-01-01", "2022-01-05")
+        hotel.reserve_room(102, "John Doe", "2022-01-01", "2022-01-05")
+        hotel.save_data()
+        hotel = Hotel("Fiesta", "123 Main St")
+        with patch('storage.COMPACTION_THRESHOLD', 3):
+            for room in (103, 104, 105):
+                hotel.reserve_room(room, "Jane Smith", "2022-01-01", "2022-01-05")
+        self.assertFalse(os.path.exists('hotel_Fiesta_journal.jsonl'))
+        reservations = Hotel("Fiesta", "123 Main St").load_data().reservations
+        self.assertEqual([r['room_number'] for r in reservations], [101, 102, 103, 104, 105])
+
+    def test_rename_keeps_reservations(self):
+        """ A renamed hotel keeps its reservations, which are saved under the new name."""
+        hotel = Hotel("Fiesta", "123 Main St").load_data()
+        hotel.reserve_room(101, "John Doe", "2022-01-01", "2022-01-05")
+        hotel.modify_information(name="Grand")
+        renamed = Hotel("Grand", None).load_data()
+        self.assertEqual([r['hotel'] for r in renamed.reservations], ["Grand"])
+        renamed.reserve_room(101, "Jane Smith", "2022-01-02", "2022-01-04")
+        self.assertFalse(Hotel("Grand", None).verify_room_availability(101, "2022-01-02", "2022-01-04"))
+        self.assertEqual(len(Hotel("Grand", None).load_data().reservations), 1)
+
+    def test_save_is_atomic(self):
+        """ Saving replaces the data file without leaving the temporary file behind."""
+        hotel = Hotel("Fiesta", "123 Main St").load_data()
+        hotel.reserve_room(102, "John Doe", "2022-01-01", "2022-01-05")
+        hotel.save_data()
+        self.assertEqual(sorted(os.listdir(self.directory)), ['hotel_Fiesta.lock', 'hotel_Fiesta_data.json'])
+
+    def test_concurrent_bookings(self):
+        """ Only one of several processes booking the same room at once gets it."""
+        with ProcessPoolExecutor(4) as executor:
+            list(executor.map(book_room, [self.directory] * 4, ["Guest 1", "Guest 2", "Guest 3", "Guest 4"]))
+        reservations = Hotel("Fiesta", "123 Main St").load_data().reservations
+        self.assertEqual(len(reservations), 1)
+
+
+class SqliteHotelTestCase(unittest.TestCase):
+    """
+    Test case for the Hotel class with the SQLite storage.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a hotel in an in-memory database holding one reservation.
+        """
+        self.storage = SqliteStorage(':memory:')
+        self.addCleanup(self.storage.close)
+        hotel = Hotel("Fiesta", "123 Main St.", list(range(101, 111)), storage=self.storage)
+        hotel.reserve_room(101, "John Doe", "2022-01-01", "2022-02-15")
+        self.hotel = Hotel("Fiesta", "123 Main St", list(range(101, 111)), storage=self.storage)
+
+    def test_load_data(self):
+        """ Test case 1: Load hotel data from the database."""
+        loaded_hotel = self.hotel.load_data()
+        self.assertEqual(loaded_hotel.address, "123 Main St.")
+        self.assertEqual(loaded_hotel.rooms, list(range(101, 111)))
+        self.assertEqual(loaded_hotel.reservations, [{"id": 1, "customer": "John Doe", "hotel": "Fiesta", "room_number": 101, "start_date": "2022-01-01", "end_date": "2022-02-15"}])
+        self.assertIsNone(Hotel("Plaza", "1 Elm St", storage=self.storage).load_data())
+
+    def test_verify_room_availability(self):
+        """ Verify room availability with a range query."""
+        self.assertTrue(self.hotel.verify_room_availability(102, '2021-10-01', '2021-10-15'))
+        self.assertFalse(self.hotel.verify_room_availability(101, '2022-01-01', '2022-02-15'))
+        self.assertTrue(self.hotel.verify_room_availability(101, '2022-02-15', '2022-02-20'))
+
+    def test_reserve_room(self):
+        """ Test reserving a room."""
+        self.hotel.reserve_room(102, "John Doe", "2021-10-01", "2021-10-15")
+        self.assertEqual(self.hotel.reservations, [{"id": 2, "customer": "John Doe", "hotel": "Fiesta", "room_number": 102, "start_date": "2021-10-01", "end_date": "2021-10-15"}])
+        self.hotel.reserve_room(102, "John Doe", "2021-10-01", "2021-10-15")
+        self.assertEqual(len(self.hotel.reservations), 1)
+        self.assertEqual([r['id'] for r in self.hotel.load_data().reservations], [1, 2])
+
+    def test_cancel_reservation(self):
+        """ Test canceling a reservation."""
+        self.hotel.load_data()
+        self.hotel.cancel_reservation(1)
+        self.assertEqual(self.hotel.reservations, [])
+        reloaded = Hotel("Fiesta", "123 Main St", storage=self.storage).load_data()
+        self.assertEqual(reloaded.reservations, [])
+        self.assertEqual(reloaded.rooms, list(range(101, 111)))
+
+    def test_reserve_rooms(self):
+        """ Test reserving several rooms in one transaction."""
+        results = self.hotel.reserve_rooms([(102, "Tour Group", "2022-01-01", "2022-01-05"),
+                                            (103, "Tour Group", "2022-01-01", "2022-01-05")])
+        self.assertEqual([r['status'] for r in results], ['reserved', 'reserved'])
+        reloaded = Hotel("Fiesta", "123 Main St", storage=self.storage).load_data()
+        self.assertEqual([r['id'] for r in reloaded.reservations], [1, 2, 3])
+        self.assertEqual(reloaded.rooms, list(range(101, 111)))
+
+    def test_reservation_ids_are_not_reused(self):
+        """ Cancelling the last reservation does not make its ID available again."""
+        self.hotel.load_data()
+        self.hotel.cancel_reservation(1)
+        other = Hotel("Fiesta", "123 Main St", storage=self.storage)
+        other.reserve_room(101, "Jane Smith", "2022-01-01", "2022-02-15")
+        self.assertEqual([r['id'] for r in other.reservations], [2])
+
+    def test_failed_booking_rolls_back(self):
+        """ A booking that fails half way leaves the database unchanged."""
+        reservation = {"id": 2, "customer": "Jane Smith", "hotel": "Fiesta", "room_number": 102,
+                       "start_date": "2021-10-01", "end_date": "2021-10-15"}
+        with self.assertRaises(RuntimeError):
+            with self.storage.transaction():
+                self.storage.add_reservation(self.hotel, reservation)
+                raise RuntimeError("booking failed")
+        self.assertTrue(self.hotel.verify_room_availability(102, '2021-10-01', '2021-10-15'))
+
+    def test_modify_and_delete_hotel(self):
+        """ Renaming and deleting a hotel update the stored hotel."""
+        self.hotel.load_data()
+        self.hotel.modify_information(name="Grand Fiesta", address="456 Elm St")
+        renamed = Hotel("Grand Fiesta", None, storage=self.storage).load_data()
+        self.assertEqual(renamed.address, "456 Elm St")
+        self.assertEqual(len(renamed.reservations), 1)
+        renamed.delete_hotel()
+        self.assertIsNone(Hotel("Grand Fiesta", None, storage=self.storage).load_data())
+
+    def test_unloaded_hotels_are_refreshed(self):
+        """ Hotels that were not loaded read the bookings of the others before booking."""
+        first = Hotel("Fiesta", "123 Main St", storage=self.storage)
+        second = Hotel("Fiesta", "123 Main St", storage=self.storage)
+        first.reserve_room(102, "John Doe", "2022-03-01", "2022-03-05")
+        second.reserve_room(104, "Jane Smith", "2022-03-01", "2022-03-05")
+        first.reserve_room(103, "John Doe", "2022-03-01", "2022-03-05")
+        second.reserve_room(103, "Jane Smith", "2022-03-01", "2022-03-05")
+        reservations = Hotel("Fiesta", None, storage=self.storage).load_data().reservations
+        self.assertEqual([(r['id'], r['room_number']) for r in reservations],
+                         [(1, 101), (2, 102), (3, 104), (4, 103)])
+
+    def test_cancel_keeps_removed_rooms(self):
+        """ Cancelling a reservation does not give back a room that was removed."""
+        self.hotel.load_data()
+        self.hotel.rooms.remove(101)
+        self.hotel.save_data()
+        self.hotel.cancel_reservation(1)
+        self.assertNotIn(101, Hotel("Fiesta", None, storage=self.storage).load_data().rooms)
+
+    def test_legacy_rooms_are_migrated(self):
+        """ A database written when reservations removed rooms gets them back once."""
+        self.storage.connection.execute('DELETE FROM rooms WHERE room_number = 101')
+        self.storage.connection.execute('PRAGMA user_version = 0')
+        self.storage._migrate()  # pylint: disable=protected-access
+        self.assertIn(101, Hotel("Fiesta", None, storage=self.storage).load_data().rooms)
+        self.storage.connection.execute('DELETE FROM rooms WHERE room_number = 101')
+        self.storage._migrate()  # pylint: disable=protected-access
+        self.assertNotIn(101, Hotel("Fiesta", None, storage=self.storage).load_data().rooms)
+
+
+class PartitionedHotelTestCase(unittest.TestCase):
+    """
+    Test case for the Hotel class with the month-partitioned JSON storage.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a saved hotel holding reservations in three months.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory.name)
+        self.directory = directory.name
+        hotel = Hotel("Fiesta", "123 Main St", storage=PartitionedJsonStorage())
+        hotel.reserve_room(101, "John Doe", "2022-01-01", "2022-02-15")
+        hotel.reserve_room(102, "Jane Smith", "2022-03-10", "2022-03-12")
+        hotel.reserve_room(103, "John Doe", "2022-06-01", "2022-06-05")
+        hotel.save_data()
+
+    def load(self, name="Fiesta"):
+        """ Loads the hotel with a new partitioned storage."""
+        return Hotel(name, "123 Main St", storage=PartitionedJsonStorage()).load_data()
+
+    def test_save_data(self):
+        """ Every month of reservations is saved to its own segment file."""
+        self.assertEqual(sorted(name for name in os.listdir(self.directory) if name.endswith('.json')),
+                         ['hotel_Fiesta_2022-01.json', 'hotel_Fiesta_2022-03.json',
+                          'hotel_Fiesta_2022-06.json', 'hotel_Fiesta_data.json'])
+
+    def test_load_data_reads_only_the_header(self):
+        """ Loading a hotel loads its rooms and ID counter but no reservation."""
+        hotel = self.load()
+        self.assertEqual(hotel.reservations, [])
+        self.assertEqual(hotel.rooms, list(range(101, 111)))
+        self.assertEqual(hotel.allocate_reservation_id(), 4)
+
+    def test_count_reservations(self):
+        """ The reservations not paged in are counted from the header."""
+        hotel = self.load()
+        self.assertIn("Number of Reservations: 3\n", hotel.display_information())
+        hotel.find_free_rooms("2022-03-01", "2022-03-31")
+        self.load().cancel_reservation(3)
+        hotel.load_data()
+        self.assertEqual(hotel.storage.count_reservations(hotel), 2)
+        hotel.find_free_rooms("2022-06-01", "2022-06-30")
+        self.assertEqual(hotel.storage.count_reservations(hotel), 2)
+
+    def test_queries_page_in_only_their_months(self):
+        """ A query reads only the segments that may overlap its date range."""
+        hotel = self.load()
+        self.assertNotIn(102, hotel.find_free_rooms("2022-03-01", "2022-03-31"))
+        self.assertEqual(hotel.storage.partitions["Fiesta"]['loaded'], {'2022-03'})
+        self.assertFalse(hotel.verify_room_availability(101, "2022-02-10", "2022-02-12"))
+        self.assertEqual(hotel.storage.partitions["Fiesta"]['loaded'], {'2022-01', '2022-03'})
+
+    def test_cancel_reservation(self):
+        """ Cancelling a reservation pages in its segment by ID."""
+        hotel = self.load()
+        hotel.cancel_reservation(3)
+        hotel.save_data()
+        self.assertEqual(hotel.storage.partitions["Fiesta"]['loaded'], {'2022-06'})
+        self.assertEqual(sorted(r['id'] for r in hotel.storage.stored_reservations(hotel)), [1, 2])
+        self.assertFalse(os.path.exists('hotel_Fiesta_2022-06.json'))
+
+    def test_cancel_from_journal(self):
+        """ A cancellation in the journal hides the reservation when its segment is paged in."""
+        self.load().cancel_reservation(2)
+        hotel = self.load()
+        self.assertTrue(hotel.verify_room_availability(102, "2022-03-10", "2022-03-12"))
+        hotel.reserve_room(104, "Jane Smith", "2022-03-20", "2022-03-22")
+        hotel.save_data()
+        self.assertEqual(sorted(r['id'] for r in hotel.storage.stored_reservations(hotel)), [1, 3, 4])
+
+    def test_save_keeps_segments_not_paged_in(self):
+        """ Saving a hotel rewrites only its changed months and keeps the others."""
+        hotel = self.load()
+        hotel.reserve_room(105, "Jane Smith", "2022-06-10", "2022-06-12")
+        hotel.save_data()
+        self.assertEqual(len(hotel.reservations), 2)
+        self.assertEqual(sorted(r['id'] for r in hotel.storage.stored_reservations(hotel)), [1, 2, 3, 4])
+
+    def test_modify_information(self):
+        """ Renaming a hotel moves all of its segments to files with the new name."""
+        hotel = self.load()
+        hotel.modify_information(name="Gala")
+        self.assertFalse(os.path.exists('hotel_Fiesta_2022-01.json'))
+        hotel = self.load("Gala")
+        self.assertEqual({r['hotel'] for r in hotel.storage.stored_reservations(hotel)}, {"Gala"})
+        self.assertEqual(len(hotel.storage.stored_reservations(hotel)), 3)
+
+    def test_load_json_storage_file(self):
+        """ A hotel saved by the JSON storage is loaded at once and partitioned on save."""
+        hotel = Hotel("Gala", "123 Main St")
+        hotel.reserve_room(101, "John Doe", "2022-01-01", "2022-01-05")
+        hotel.save_data()
+        hotel = self.load("Gala")
+        self.assertEqual(len(hotel.reservations), 1)
+        hotel.save_data()
+        self.assertTrue(os.path.exists('hotel_Gala_2022-01.json'))
+        self.assertEqual(len(self.load("Gala").storage.stored_reservations(hotel)), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,73 @@
+""" Test cases for the Journal class. """
+import os
+import tempfile
+import unittest
+from journal import Journal, apply_event, cancel_event, reserve_event
+from reservation_book import ReservationBook
+
+class JournalTestCase(unittest.TestCase):
+    """
+    Test case for the Journal class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with a journal in a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.journal = Journal(os.path.join(self.directory.name, 'journal.jsonl'))
+        self.reservation = {"id": 1, "customer": "John Doe", "hotel": "Fiesta", "room_number": 101,
+                            "start_date": "2022-01-01", "end_date": "2022-02-15"}
+
+    def test_append_and_read(self):
+        """ Test case 1: Events are read back in the order they were appended."""
+        self.assertEqual(self.journal.read(), [])
+        self.journal.append(reserve_event(self.reservation))
+        self.journal.append(cancel_event(self.reservation))
+        self.assertEqual(self.journal.read(), [reserve_event(self.reservation),
+                                               cancel_event(self.reservation)])
+
+    def test_read_stops_at_torn_line(self):
+        """ Test case 2: A line cut short by a crash ends the journal."""
+        self.journal.append(reserve_event(self.reservation))
+        with open(self.journal.filename, 'a', encoding='utf-8') as file:
+            file.write('{"event": "cancel", "i')
+        self.assertEqual(self.journal.read(), [reserve_event(self.reservation)])
+
+    def test_read_from(self):
+        """ Test case 3: Reading from an offset returns only the later events."""
+        self.journal.append(reserve_event(self.reservation))
+        events, offset = self.journal.read_from(0)
+        self.assertEqual(offset, os.path.getsize(self.journal.filename))
+        self.journal.append(cancel_event(self.reservation))
+        self.assertEqual(self.journal.read_from(offset)[0], [cancel_event(self.reservation)])
+        self.assertEqual(events, [reserve_event(self.reservation)])
+
+    def test_clear(self):
+        """ Test case 4: Clearing removes the journal file."""
+        self.journal.append(reserve_event(self.reservation))
+        self.journal.clear()
+        self.assertFalse(os.path.exists(self.journal.filename))
+        self.journal.clear()
+
+    def test_apply_event(self):
+        """ Test case 5: Replaying events is idempotent."""
+        reservations = ReservationBook()
+        for _ in range(2):
+            apply_event(reserve_event(self.reservation), reservations)
+        self.assertEqual(reservations, [self.reservation])
+        apply_event(reserve_event(dict(self.reservation, id=2)), reservations)
+        for _ in range(2):
+            apply_event(cancel_event(self.reservation), reservations)
+        self.assertEqual(reservations, [dict(self.reservation, id=2)])
+
+    def test_apply_event_with_taken_id(self):
+        """ Test case 6: A different reservation with a taken ID is kept under a new ID."""
+        reservations = ReservationBook([self.reservation])
+        other = dict(self.reservation, customer="Jane Smith")
+        self.assertEqual(apply_event(reserve_event(other), reservations), 2)
+        self.assertEqual(reservations, [self.reservation, dict(other, id=2)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+""" Test cases for the occupancy search across hotels. """
+import unittest
+from datetime import date
+from hotel import Hotel
+from occupancy import find_free_rooms, get_monthly_occupancy, month_range
+from storage import SqliteStorage
+
+class OccupancyTestCase(unittest.TestCase):
+    """
+    Test case for the occupancy search across hotels.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case with two hotels in an in-memory database.
+        """
+        storage = SqliteStorage(':memory:')
+        self.addCleanup(storage.close)
+        self.fiesta = Hotel("Fiesta", "123 Main St", [101, 102, 103], storage=storage)
+        self.plaza = Hotel("Plaza", "456 Elm St", [201, 202], storage=storage)
+        self.fiesta.reserve_room(101, "John Doe", "2022-02-27", "2022-03-02")
+        self.fiesta.reserve_room(102, "Jane Smith", "2022-03-10", "2022-03-12")
+        self.plaza.reserve_room(201, "John Doe", "2022-03-01", "2022-03-03")
+
+    def test_month_range(self):
+        """ Test case 1: A month is the range from its first day to the first day of the next."""
+        self.assertEqual(month_range(2024, 2), ("2024-02-01", "2024-03-01"))
+        self.assertEqual(month_range(2022, 12), ("2022-12-01", "2023-01-01"))
+
+    def test_find_free_rooms(self):
+        """ Test case 2: Reserved rooms stay listed as rooms of the hotel and are free on other dates."""
+        self.assertEqual(find_free_rooms([self.fiesta, self.plaza], date(2022, 3, 1), date(2022, 3, 11)),
+                         {"Fiesta": [103], "Plaza": [202]})
+        self.assertEqual(find_free_rooms([self.fiesta, self.plaza], "2022-03-05", "2022-03-06"),
+                         {"Fiesta": [101, 102, 103], "Plaza": [201, 202]})
+
+    def test_monthly_occupancy(self):
+        """ Test case 3: Count the reserved rooms of every night of a month."""
+        occupancy = get_monthly_occupancy([self.fiesta, self.plaza], 2022, 3)
+        self.assertEqual(len(occupancy["Fiesta"]), 31)
+        self.assertEqual(occupancy["Fiesta"][:3], [("2022-03-01", 1), ("2022-03-02", 0), ("2022-03-03", 0)])
+        self.assertEqual(occupancy["Fiesta"][9:12], [("2022-03-10", 1), ("2022-03-11", 1), ("2022-03-12", 0)])
+        self.assertEqual(occupancy["Plaza"][:3], [("2022-03-01", 1), ("2022-03-02", 1), ("2022-03-03", 0)])
+
+if __name__ == '__main__':
+    unittest.main()
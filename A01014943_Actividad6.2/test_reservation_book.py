@@ -0,0 +1,45 @@
+""" Test cases for the ReservationBook class. """
+import unittest
+from reservation_book import ReservationBook
+
+class ReservationBookTestCase(unittest.TestCase):
+    """
+    Test case for the ReservationBook class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case by creating a book with two reservations.
+        """
+        self.reservations = [
+            {"id": 1, "customer": "John Doe", "hotel": "Fiesta", "room_number": 101,
+             "start_date": "2022-01-01", "end_date": "2022-02-15"},
+            {"id": 3, "customer": "Jane Smith", "hotel": "Fiesta", "room_number": 102,
+             "start_date": "2022-03-01", "end_date": "2022-03-05"},
+        ]
+        self.book = ReservationBook(self.reservations)
+
+    def test_list_behaviour(self):
+        """ Test case 1: The book iterates and compares like a list of reservations."""
+        self.assertEqual(self.book, self.reservations)
+        self.assertEqual(list(self.book), self.reservations)
+        self.assertEqual(len(self.book), 2)
+        self.assertIn(self.reservations[1], self.book)
+        self.assertNotIn(dict(self.reservations[1], room_number=103), self.book)
+        self.assertEqual(ReservationBook(), [])
+
+    def test_lookup_by_id(self):
+        """ Test case 2: Reservations are found and removed by ID."""
+        self.assertEqual(self.book.get(3), self.reservations[1])
+        self.assertIsNone(self.book.get(2))
+        self.assertEqual(self.book.pop(1), self.reservations[0])
+        self.assertIsNone(self.book.pop(1))
+        self.assertEqual(self.book, [self.reservations[1]])
+
+    def test_next_id(self):
+        """ Test case 3: The next ID follows the highest ID in the book."""
+        self.assertEqual(self.book.next_id(), 4)
+        self.assertEqual(ReservationBook().next_id(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+""" Test cases for the RoomSet class. """
+import unittest
+from rooms import Room, RoomSet
+
+class RoomSetTestCase(unittest.TestCase):
+    """
+    Test case for the RoomSet class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case by creating a set of three rooms, one out of service.
+        """
+        self.rooms = RoomSet([101, 102, 103], out_of_service=[102])
+
+    def test_list_behaviour(self):
+        """ Test case 1: The set iterates and compares like the list of rooms in service."""
+        self.assertEqual(self.rooms, [101, 103])
+        self.assertEqual(repr(self.rooms), "[101, 103]")
+        self.assertEqual(len(self.rooms), 3)
+        self.assertIn(101, self.rooms)
+        self.assertNotIn(102, self.rooms)
+        self.assertNotIn(104, self.rooms)
+        self.assertEqual(RoomSet(), [])
+
+    def test_changes(self):
+        """ Test case 2: Rooms are added, removed and put back in service by number."""
+        self.rooms.add(104)
+        self.rooms.add(101)
+        self.rooms.remove(103)
+        self.rooms.set_in_service(102, True)
+        self.assertEqual(self.rooms.numbers(), [101, 102, 104])
+        self.assertEqual(self.rooms.out_of_service(), [])
+
+    def test_room_slots(self):
+        """ Test case 3: Rooms have no per-instance dictionary."""
+        self.assertFalse(hasattr(Room(101), '__dict__'))
+
+if __name__ == '__main__':
+    unittest.main()